@@ -0,0 +1,96 @@
+"""
+This file defines the Analyzer class, which evaluates every column of a position in a background thread.
+The columns are searched with the Minimax algorithm of MinimaxPlayer using iterative deepening, and after every
+completed column search the score and depth are streamed through a queue, so a user interface can show the
+progressive results while deeper searches are still running. The analysis stops as soon as it is cancelled.
+"""
+
+import queue
+import threading
+
+from game.player import SearchCancelled
+from algorithms.minimax import MinimaxPlayer
+from algorithms.stats import SearchStats
+
+SCORE_UNITS = ["", "k", "M", "G", "T", "P", "E"]
+
+class Analyzer:
+    def __init__(self, board, piece, max_depth=None):
+        """
+        Start analyzing a copy of the board for the player with the given piece to move.
+        Without max_depth the search deepens until all remaining cells are filled or the analysis is cancelled.
+        """
+        self.board = board.copy()
+        self.piece = piece
+        empty = board.rows * board.columns - board.get_move_count()
+        self.max_depth = empty if max_depth is None else min(max_depth, empty)
+        self.updates = queue.Queue()
+        self.scores = {}
+        self.stop_event = threading.Event()
+        self.player = MinimaxPlayer("Analysis", piece)
+        self.player.stop_event = self.stop_event
+        self.player.last_stats = SearchStats()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """
+        Search every valid column with increasing depth and put (col, score, depth) on the update queue.
+        """
+        board = self.board
+        self.player.start_search(board)
+        try:
+            for depth in range(1, self.max_depth + 1):
+                for col in range(board.columns):
+                    if board.is_valid_move(col):
+                        row = self.player.play(board, col, self.piece)
+                        try:
+                            score = self.player.minimax(board, depth - 1, -float('inf'), float('inf'), False)
+                        finally:
+                            self.player.undo(board, row, col, self.piece)
+                        self.updates.put((col, score, depth))
+        except SearchCancelled:
+            pass
+
+    def poll(self):
+        """
+        Apply the queued updates and return True if any column score changed.
+        self.scores maps each analyzed column to a tuple (score, depth).
+        """
+        changed = False
+        while True:
+            try:
+                col, score, depth = self.updates.get_nowait()
+            except queue.Empty:
+                return changed
+            self.scores[col] = (score, depth)
+            changed = True
+
+    def done(self):
+        """
+        Check if the analysis has finished.
+        """
+        return not self.thread.is_alive()
+
+    def cancel(self, timeout=1.0):
+        """
+        Stop the analysis and wait until the background thread has finished.
+        """
+        self.stop_event.set()
+        self.thread.join(timeout)
+
+def format_score(score):
+    """
+    Format a score compactly with a unit suffix, e.g. 1520000 becomes "1.5M".
+    """
+    if score in (float('inf'), -float('inf')):
+        return "+inf" if score > 0 else "-inf"
+    value = abs(score)
+    unit = 0
+    while value >= 1000 and unit < len(SCORE_UNITS) - 1:
+        value /= 1000
+        unit += 1
+    sign = "-" if score < 0 else ""
+    if unit == 0:
+        return f"{sign}{value:.0f}"
+    return f"{sign}{value:.3g}{SCORE_UNITS[unit]}"
@@ -0,0 +1,117 @@
+"""
+This file defines an asyncio facade for the engines, so that an asyncio application (e.g. a web server) can
+compute moves without blocking its event loop. The searches run in a bounded thread pool, the number of
+searches in flight is limited by a semaphore, and identical concurrent requests for the same position share
+a single search. When all tasks awaiting a search are cancelled, the search is stopped cooperatively through
+the engine's stop_event.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from game.board import Board
+from game.position import Position
+from algorithms.engines import create_engine, timed_move
+
+def search(sequence, engine, settings, time_limit, stop_event):
+    """
+    Compute the move for the position in a worker thread. Returns (move, stats).
+    """
+    board = Board.from_sequence(sequence)
+    player = create_engine(engine, 1 if len(sequence) % 2 == 0 else 2, **settings)
+    if time_limit is not None:
+        move, stats, _ = timed_move(player, board, sequence, time_limit, stop_event)
+        return move, stats
+    player.stop_event = stop_event
+    return player.get_move(board, sequence), player.last_stats
+
+class SharedSearch:
+    def __init__(self, task, stop_event):
+        """
+        A running search together with the number of requests waiting for its result.
+        """
+        self.task = task
+        self.stop_event = stop_event
+        self.waiters = 0
+
+class AsyncEngine:
+    def __init__(self, max_workers=4, max_searches=None):
+        """
+        Initialize the facade with a pool of max_workers threads. At most max_searches searches
+        (default: max_workers) run at the same time, further searches wait for a free slot.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.semaphore = asyncio.Semaphore(max_searches or max_workers)
+        self.searches = {}
+
+    async def get_move(self, sequence, engine="MinimaxPlayer", time_limit=None, **settings):
+        """
+        Compute the move for the position after the sequence (1-indexed columns) with the engine and its settings.
+        Returns (move, stats) like the engine's get_move and last_stats. Concurrent requests for the same position
+        and engine configuration wait for the same search.
+        """
+        key = (Position.from_sequence(sequence).key(), engine, repr(sorted(settings.items())), time_limit)
+        shared = self.searches.get(key)
+        if shared is None:
+            stop_event = threading.Event()
+            task = asyncio.ensure_future(self.run(sequence, engine, settings, time_limit, stop_event))
+            shared = self.searches[key] = SharedSearch(task, stop_event)
+            task.add_done_callback(lambda _: self.searches.pop(key, None) if self.searches.get(key) is shared else None)
+
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        except asyncio.CancelledError:
+            if shared.waiters == 1 and not shared.task.done():
+                # Nobody else waits for this search anymore
+                shared.task.cancel()
+                if self.searches.get(key) is shared:
+                    del self.searches[key]
+            raise
+        finally:
+            shared.waiters -= 1
+
+    async def run(self, sequence, engine, settings, time_limit, stop_event):
+        """
+        Run a search in the thread pool once a slot is free. If the search is cancelled, the engine is
+        stopped and the slot is only released after the worker thread has finished.
+        """
+        async with self.semaphore:
+            future = self.executor.submit(search, sequence, engine, settings, time_limit, stop_event)
+            result = asyncio.wrap_future(future)
+            try:
+                return await asyncio.shield(result)
+            except asyncio.CancelledError:
+                stop_event.set()
+                if not future.cancel():
+                    await asyncio.wait([result])
+                    if not result.cancelled():
+                        result.exception()  # Mark the expected SearchCancelled as retrieved
+                raise
+
+    def in_flight(self):
+        """
+        Return the number of distinct searches that are queued or running.
+        """
+        return len(self.searches)
+
+    def shutdown(self):
+        """
+        Stop all searches and shut down the thread pool.
+        """
+        for shared in self.searches.values():
+            shared.stop_event.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+# Facade used by get_move_async, created on first use
+default_engine = None
+
+async def get_move_async(sequence, engine="MinimaxPlayer", time_limit=None, **settings):
+    """
+    Compute a move without blocking the event loop, using a shared AsyncEngine. See AsyncEngine.get_move.
+    """
+    global default_engine
+    if default_engine is None:
+        default_engine = AsyncEngine()
+    return await default_engine.get_move(sequence, engine, time_limit, **settings)
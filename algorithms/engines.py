@@ -0,0 +1,151 @@
+"""
+This file defines a registry of the available Connect 4 engines, so that tools such as the tournament runner
+can create players by name together with their settings (e.g. search depth or iteration budget),
+and helpers to reuse engines within a process and to compute a move within a time limit.
+"""
+
+import ast
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from game.player import SearchCancelled
+from algorithms.minimax import MinimaxPlayer, MinimaxPlayer2
+from algorithms.minimax2 import MinimaxPlayer3
+from algorithms.mcts import MCTSPlayer, MCTSSolverPlayer
+from algorithms.solver import SolverPlayer
+
+ENGINES = {
+    "MinimaxPlayer": MinimaxPlayer,
+    "MinimaxPlayer2": MinimaxPlayer2,
+    "MinimaxPlayer3": MinimaxPlayer3,
+    "MCTSPlayer": MCTSPlayer,
+    "MCTSSolverPlayer": MCTSSolverPlayer,
+    "SolverPlayer": SolverPlayer,
+}
+
+# Fraction of the time limit after which engines with their own time control (time_limit) stop searching
+SOFT_TIME_LIMIT = 0.9
+
+# Engines created by get_engine in this process, keyed by engine name, settings and piece, least recently used first
+instances = OrderedDict()
+# Maximum number of engines kept by get_engine
+MAX_INSTANCES = 16
+
+def create_engine(engine, piece, name=None, **settings):
+    """
+    Create an engine by its registry name for the given piece. Additional keyword arguments
+    are passed to the engine's constructor.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    return ENGINES[engine](name or engine, piece, **settings)
+
+def check_settings(engine, settings):
+    """
+    Check the settings of an engine against the parameters of its constructor without creating it: every setting
+    must be a parameter with a default value, and its value must have the type of the default (an int is also
+    accepted for a float, a number for a default of None). Raises ValueError with a message otherwise.
+    Values the constructor rejects itself (e.g. an unknown search) are only detected when the engine is created.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    parameters = inspect.signature(ENGINES[engine]).parameters
+    for key, value in settings.items():
+        parameter = parameters.get(key)
+        if key in ("name", "piece") or parameter is None or parameter.default is inspect.Parameter.empty:
+            raise ValueError(f"Unknown setting of {engine}: {key}")
+        default = parameter.default
+        if isinstance(default, bool) or isinstance(value, bool):
+            valid = isinstance(default, bool) and isinstance(value, bool)
+        elif isinstance(default, float) or default is None:
+            valid = isinstance(value, (int, float)) or (default is None and value is None)
+        else:
+            valid = isinstance(value, type(default))
+        if not valid:
+            expected = "number" if default is None else type(default).__name__
+            raise ValueError(f"Setting {key} of {engine} must be of type {expected}, not {type(value).__name__}")
+
+def parse_engine(spec):
+    """
+    Parse an engine specification of the form "Engine:key=value,key=value".
+    The optional key "label" sets the name used in the report.
+    """
+    engine, _, options = spec.partition(":")
+    settings = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        try:
+            settings[key.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            settings[key.strip()] = value.strip()
+    label = str(settings.pop("label", spec))
+    return {"label": label, "engine": engine, "settings": settings}
+
+def get_engine(engine, settings, piece):
+    """
+    Return the engine of this process for the given settings and piece, creating it on first use.
+    Only the MAX_INSTANCES most recently used engines are kept.
+    """
+    key = (engine, repr(sorted(settings.items())), piece)
+    if key in instances:
+        instances.move_to_end(key)
+    else:
+        instances[key] = create_engine(engine, piece, **settings)
+        if len(instances) > MAX_INSTANCES:
+            instances.popitem(last=False)
+    return instances[key]
+
+def timed_move(player, board, sequence, time_limit, stop_event=None):
+    """
+    Compute the move of the player within the time limit (in seconds).
+    Engines with a search depth use iterative deepening up to their depth and return the move of the deepest
+    completed search: the principal variation search deepens by itself (see pvs.py), other searches are repeated
+    with increasing depth (a move from the opening book or the endgame solver ends the deepening). Engines with their
+    own time control stop in time, all other engines are cancelled through their stop_event, which raises
+    SearchCancelled.
+    Returns the move, the statistics of the search that produced it and whether the search was complete,
+    i.e. not cut short by the time limit. A stop_event can be given to also stop the search from outside.
+    """
+    if stop_event is None:
+        stop_event = threading.Event()
+    timer = threading.Timer(time_limit, stop_event.set)
+    player.stop_event = stop_event
+    timer.start()
+    start = time.perf_counter()
+    try:
+        if getattr(player, "search", None) == "pvs":
+            # The principal variation search deepens iteratively itself and keeps its last completed iteration
+            move = player.get_move(board.copy(), sequence)
+            stats = player.last_stats
+            return move, stats, not stats.cancelled
+        elif hasattr(player, "depth"):
+            max_depth = player.depth
+            move, stats = None, None
+            try:
+                for depth in range(1, max_depth + 1):
+                    player.depth = depth
+                    move = player.get_move(board.copy(), sequence)
+                    stats = player.last_stats
+                    if stats.book or stats.solved:
+                        break
+            except SearchCancelled:
+                if move is None:
+                    raise
+                return move, stats, False
+            finally:
+                player.depth = max_depth
+            return move, stats, True
+        elif hasattr(player, "time_limit"):
+            engine_time_limit = player.time_limit
+            player.time_limit = time_limit * SOFT_TIME_LIMIT
+            try:
+                move = player.get_move(board, sequence)
+            finally:
+                player.time_limit = engine_time_limit
+            return move, player.last_stats, time.perf_counter() - start < time_limit * SOFT_TIME_LIMIT
+        return player.get_move(board, sequence), player.last_stats, True
+    finally:
+        timer.cancel()
+        player.stop_event = None
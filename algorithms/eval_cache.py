@@ -0,0 +1,80 @@
+"""
+This file defines the EvalCache class, a fixed-size cache of heuristic leaf evaluations for the Minimax players.
+It is set-associative: a key can only be stored in the few entries (ways) of its set, and a new entry replaces
+the least recently used entry of the set, so lookups and stores take constant time and the memory use is fixed.
+The cache is independent of the transposition table of the solver. Its hit and miss counters are kept over the
+lifetime of the cache, so its size can be tuned on real games.
+"""
+
+# Multiplier of the Fibonacci hashing that spreads the keys over the sets
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+class EvalCache:
+    def __init__(self, size=1 << 16, ways=2):
+        """
+        Initialize an empty cache with room for size entries (rounded down to a power of two) in sets of ways entries.
+        ways=1 gives a direct-mapped cache.
+        """
+        self.ways = ways
+        self.sets = 1 << max(0, (size // ways).bit_length() - 1)
+        self.size = self.sets * ways
+        self.keys = [None] * self.size
+        self.values = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+
+    def slot(self, key):
+        """
+        Return the index of the first entry of the set of a key.
+        """
+        return ((key * HASH_MULTIPLIER) >> 32) % self.sets * self.ways
+
+    def get(self, key):
+        """
+        Return the value stored for the key, or None if it is not in the cache.
+        """
+        slot = self.slot(key)
+        keys = self.keys
+        for index in range(slot, slot + self.ways):
+            if keys[index] == key:
+                self.hits += 1
+                value = self.values[index]
+                if index != slot:
+                    # Move the entry to the front of its set (most recently used)
+                    keys[slot + 1:index + 1] = keys[slot:index]
+                    self.values[slot + 1:index + 1] = self.values[slot:index]
+                    keys[slot], self.values[slot] = key, value
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """
+        Store a value at the front of the key's set, replacing the least recently used entry of the set.
+        """
+        slot = self.slot(key)
+        end = slot + self.ways - 1
+        self.keys[slot + 1:end + 1] = self.keys[slot:end]
+        self.values[slot + 1:end + 1] = self.values[slot:end]
+        self.keys[slot], self.values[slot] = key, value
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters.
+        """
+        self.keys = [None] * self.size
+        self.values = [None] * self.size
+        self.hits = self.misses = 0
+
+    def stats(self):
+        """
+        Return the size, the number of used entries, the hits, the misses and the hit rate of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": self.size,
+            "used": self.size - self.keys.count(None),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+        }
@@ -0,0 +1,572 @@
+"""
+This file defines the Evaluator interface of the search engine (see search_engine.py) and the heuristics of the
+Minimax players ported to it. An evaluator scores a board from the point of view of a player; the search engine
+provides everything else (search, threat analysis, caches, statistics), so every evaluator benefits from it.
+
+Evaluators can optionally keep state that is updated incrementally: if incremental is set, the search calls reset
+with the board at the start of every search and play and undo for every move it makes and takes back.
+Evaluators that can score several children of a board at once provide evaluate_batch (see WindowEvaluator).
+
+PaperEvaluator is the heuristic of MinimaxPlayer (modified from https://www.scirp.org/html/1-9601415_90972.htm),
+BasicEvaluator the basic version of MinimaxPlayer3 and BitboardEvaluator the custom heuristic of MinimaxPlayer2.
+"""
+
+import functools
+from operator import itemgetter
+
+import numpy as np
+
+from game.geometry import get_geometry
+from algorithms.threats import board_masks, winning_cells
+
+# Weights of the five cells of a window in its pattern code (see batch_tables)
+PATTERN_DIGITS = np.array([1, 3, 9, 27, 81], dtype=np.float64)
+
+def column_weight(col, columns):
+    """
+    Weight of a single piece in a column: 40 on the edges, 70 and 120 further in and 200 in the middle.
+    The center column counts another 120.
+    """
+    weight = {0: 40, 1: 70, 2: 120}.get(min(col, columns - 1 - col), 200)
+    if col == columns // 2:
+        weight += 120
+    return weight
+
+@functools.lru_cache(maxsize=None)
+def cell_weights(rows, columns):
+    """
+    Return the weight of every cell of a board size in the order of the flattened board.
+    """
+    return tuple(column_weight(col, columns) for row in range(rows) for col in range(columns))
+
+@functools.lru_cache(maxsize=None)
+def window_cells(rows, columns):
+    """
+    Return the windows of PaperEvaluator for a board size as (flat cell indices, is_win_window) in
+    evaluation order. Windows of four cells are the lines of the board geometry.
+    Win windows of five cells put one more cell in front of a line's cells: the cell left of a horizontal line,
+    the cell up-left of a diagonal line and the cell beyond the upper-right end of an anti-diagonal line,
+    where these cells exist (and, for horizontal lines, the line does not start in the first column).
+    """
+    geometry = get_geometry(rows, columns)
+    windows = []
+    for index, line in geometry.lines_of("horizontal"):
+        row, col = line[0]
+        windows.append((geometry.flat_lines[index], False))
+        if col >= 1:
+            windows.append(((geometry.flat_index(row, col - 1),) + geometry.flat_lines[index], True))
+    for index, _ in geometry.lines_of("vertical"):
+        windows.append((geometry.flat_lines[index], False))
+    for index, line in geometry.lines_of("diagonal"):
+        row, col = line[0]
+        windows.append((geometry.flat_lines[index], False))
+        if row >= 1 and col >= 1:
+            windows.append(((geometry.flat_index(row - 1, col - 1),) + geometry.flat_lines[index], True))
+    for index, line in geometry.lines_of("anti_diagonal"):
+        row, col = line[-1]
+        windows.append((geometry.flat_lines[index], False))
+        if row >= 1 and col + 1 < columns:
+            windows.append(((geometry.flat_index(row - 1, col + 1),) + geometry.flat_lines[index], True))
+    return tuple(windows)
+
+@functools.lru_cache(maxsize=None)
+def scoring_windows(rows, columns):
+    """
+    Build the tables of PaperEvaluator.evaluate for a board size: the weight of every cell and the windows
+    as (getter, is_win_window) in evaluation order (see window_cells).
+    """
+    windows = tuple((itemgetter(*cells), is_win_window) for cells, is_win_window in window_cells(rows, columns))
+    return cell_weights(rows, columns), windows
+
+@functools.lru_cache(maxsize=None)
+def batch_tables(windows, rows, columns):
+    """
+    Build the NumPy tables of WindowEvaluator.evaluate_batch for windows (flat cell indices, is_win_window) of a
+    board size: the cell weights, the cells of all windows as an array with five columns (shorter windows are
+    padded with an extra cell that is always empty) and the offset of every window in the pattern tables
+    (0 for plain windows, 3^5 for win windows).
+    The pattern code of a window is the sum of its cells times 1, 3, 9, 27 and 81 plus its offset.
+    """
+    weights = np.array(cell_weights(rows, columns), dtype=np.int64)
+    padding = rows * columns
+    cells = np.array([cells + (padding,) * (5 - len(cells)) for cells, _ in windows])
+    offsets = np.array([3 ** 5 if is_win_window else 0 for _, is_win_window in windows])
+    return weights, cells, offsets
+
+class Evaluator:
+    """
+    Interface of the evaluators of the search engine. Subclasses override evaluate and, if needed, the hooks.
+    """
+    # Whether the score depends on the remaining search depth (otherwise cached leaf scores are shared by all depths)
+    depth_dependent = True
+    # Whether the search calls reset, play and undo
+    incremental = False
+    # Optional method evaluate_batch(board, mover, moves, piece, depth), see WindowEvaluator
+    evaluate_batch = None
+
+    def evaluate(self, board, piece, depth):
+        """
+        Score the board from the point of view of the player with the given piece. depth is the remaining depth.
+        """
+        raise NotImplementedError
+
+    def is_terminal(self, board):
+        """
+        Check if the search stops at this board regardless of the remaining depth.
+        """
+        return board.check_winner(1) or board.check_winner(2)
+
+    def reset(self, board):
+        """
+        Initialize the incremental state from the board at the root of a search.
+        """
+
+    def play(self, board, row, col, piece):
+        """
+        Update the incremental state after the piece has been dropped into the cell (row, col) of the board.
+        """
+
+    def undo(self, board, row, col, piece):
+        """
+        Update the incremental state before the piece is removed from the cell (row, col) of the board.
+        """
+
+class WindowEvaluator(Evaluator):
+    """
+    Base class of the heuristics that add up the weights of a player's pieces and the scores of windows of cells.
+    Subclasses provide the windows and the score of a window; the scores of all window contents are tabulated
+    once per piece and depth, so that evaluate_batch can score many boards with a few NumPy operations.
+    """
+    def __init__(self):
+        """
+        Initialize the empty pattern tables.
+        """
+        self.patterns = {}
+
+    def windows(self, rows, columns):
+        """
+        Return the windows as (flat cell indices, is_win_window) in evaluation order.
+        """
+        raise NotImplementedError
+
+    def window_score(self, window, is_win_window, piece, depth):
+        """
+        Score the contents of a window (a tuple of cells) for the player with the given piece.
+        """
+        raise NotImplementedError
+
+    def pattern_scores(self, piece, depth):
+        """
+        Return the scores of all window patterns for the piece at the depth, indexed by the pattern code of
+        batch_tables, as (integer scores, float scores, is_float). The tables are built once per piece and depth
+        with window_score.
+        """
+        key = (piece, depth)
+        if key not in self.patterns:
+            scores = []
+            for code in range(2 * 3 ** 5):
+                window = tuple(code // 3 ** i % 3 for i in range(5))
+                if code < 3 ** 5:
+                    scores.append(self.window_score(window[:4], False, piece, depth))
+                else:
+                    scores.append(self.window_score(window, True, piece, depth))
+            self.patterns[key] = (np.array([0 if isinstance(score, float) else score for score in scores], dtype=np.int64),
+                                  np.array(scores, dtype=np.float64),
+                                  np.array([isinstance(score, float) for score in scores]))
+        return self.patterns[key]
+
+    def evaluate_batch(self, board, mover, moves, piece, depth):
+        """
+        Score the children of the board after each of the moves (row, col) of the mover from the point of view of
+        the piece in one NumPy pass. Every score is equal to evaluate of the child, including its type (int or
+        float): the window scores are summed in the same order, as integers up to the first float score and as
+        floats from there on.
+        """
+        weight_table, window_cells, offsets = batch_tables(self.windows(board.rows, board.columns), board.rows, board.columns)
+        cells = np.zeros((len(moves), board.rows * board.columns + 1))
+        cells[:, :-1] = board.board.ravel()
+        for index, (row, col) in enumerate(moves):
+            cells[index, row * board.columns + col] = mover
+        codes = (cells[:, window_cells] @ PATTERN_DIGITS).astype(np.intp) + offsets
+        rows = np.arange(len(moves))
+        columns = np.arange(codes.shape[1] + 1)
+
+        totals = []
+        for player in (piece, 2 if piece == 1 else 1):
+            int_table, float_table, is_float_table = self.pattern_scores(player, depth)
+            weights = (cells[:, :-1] == player) @ weight_table
+            is_float = is_float_table[codes]
+            if not is_float.any():
+                # Integer scores only, the order of the sum does not matter
+                totals.append((weights + int_table[codes].sum(axis=1)).tolist())
+                continue
+            # Column 0 holds the weights of the single pieces, then the windows in evaluation order
+            int_scores = np.column_stack((weights, int_table[codes]))
+            float_scores = np.column_stack((weights, float_table[codes]))
+            is_float = np.column_stack((np.zeros(len(moves), dtype=bool), is_float))
+            has_float = is_float.any(axis=1)
+            first_float = np.where(has_float, is_float.argmax(axis=1), len(columns))
+            int_sums = np.cumsum(int_scores, axis=1)
+            # Sum the floats one after the other, starting with the integer sum before the first float score
+            float_scores = np.where(columns >= first_float[:, None], float_scores, 0.0)
+            float_scores[rows, first_float - 1] = int_sums[rows, first_float - 1]
+            float_sums = np.cumsum(float_scores, axis=1)[:, -1]
+            totals.append([float(float_sums[i]) if has_float[i] else int(int_sums[i, -1]) for i in rows])
+
+        scores = []
+        for own_score, opponent_score in zip(*totals):
+            if isinstance(own_score, float) or isinstance(opponent_score, float):
+                scores.append(float(own_score) - float(opponent_score))
+            else:
+                scores.append(own_score - opponent_score)
+        return scores
+
+class PaperEvaluator(WindowEvaluator):
+    """
+    Heuristic of MinimaxPlayer: weighted single pieces, windows of four cells and windows of five cells for open
+    threes, with scores that depend on the remaining depth.
+    """
+    def windows(self, rows, columns):
+        """
+        Return the windows of four and five cells (see window_cells).
+        """
+        return window_cells(rows, columns)
+
+    def window_score(self, window, is_win_window, piece, depth):
+        """
+        Score a window with evaluate_window or evaluate_window_win.
+        """
+        if is_win_window:
+            return self.evaluate_window_win(window, piece, depth)
+        return self.evaluate_window(window, piece, depth)
+
+    def evaluate(self, board, piece, depth):
+        """
+        Evaluate the board state heuristically.
+        """
+        weights, windows = scoring_windows(board.rows, board.columns)
+        cells = board.board.ravel().tolist()
+
+        def score_position(piece):
+            # Feature 4: Single chessman in different columns, the center column has higher value
+            score = sum(weight for weight, cell in zip(weights, cells) if cell == piece)
+
+            # Windows of four cells, and windows of five cells for open threes
+            for getter, is_win_window in windows:
+                if is_win_window:
+                    score += self.evaluate_window_win(getter(cells), piece, depth)
+                else:
+                    score += self.evaluate_window(getter(cells), piece, depth)
+            return score
+
+        score = score_position(piece)
+        opponent_piece = 2 if piece == 1 else 1
+        score -= score_position(opponent_piece)
+        return score
+
+    def evaluate_window(self, window, piece, depth):
+        """
+        Evaluate a window (subset of the board) heuristically.
+        """
+        score = 0
+        opponent_piece = 2 if piece == 1 else 1
+
+        if window.count(piece) == 4:
+            score += 10000000000 * (1/(depth+1))  # Winning move, no depth factor needed
+        elif window.count(piece) == 3 and window.count(0) == 1:
+            score += 900000  # Potential win in one move
+            if depth == 1:
+                score += 10000000000000000
+        elif window.count(piece) == 2 and window.count(0) == 2:
+            score += 50000  # Potential setup for future win
+        elif window.count(piece) == 1 and window.count(0) == 3:
+            score += 10000  # Minimal but positive setup
+        elif window.count(opponent_piece) == 3 and window.count(0) == 1:
+            if depth == 1:
+                score -= 20000000000 * (1/(depth+1))  # Blocking opponent's win
+
+        return score
+
+    def evaluate_window_win(self, window, piece, depth):
+        """
+        Evaluate a window for potential winning moves.
+        """
+        score = 0
+        opponent_piece = 2 if piece == 1 else 1
+        if window.count(piece) == 3 and window[0] == 0 and window[4] == 0:
+            return 10000000000 * (1/(depth+1))
+        elif window.count(opponent_piece) == 3 and window[0] == 0 and window[4] == 0:
+            if depth == 1:
+                score -= 20000000000 * (1/(depth+1))  # Blocking opponent's win
+
+        return 0
+
+class BasicEvaluator(WindowEvaluator):
+    """
+    Heuristic of MinimaxPlayer3, the basic version of PaperEvaluator: weighted single pieces and the windows of
+    four cells, independent of the depth.
+    """
+    depth_dependent = False
+
+    def windows(self, rows, columns):
+        """
+        Return the lines of four cells of the board geometry.
+        """
+        return tuple((line, False) for line in get_geometry(rows, columns).flat_lines)
+
+    def window_score(self, window, is_win_window, piece, depth):
+        """
+        Score a window with evaluate_window.
+        """
+        return self.evaluate_window(window, piece)
+
+    def evaluate(self, board, piece, depth):
+        """
+        Evaluate the board state heuristically.
+        """
+        geometry = get_geometry(board.rows, board.columns)
+        weights = cell_weights(board.rows, board.columns)
+        cells = board.board.ravel().tolist()
+
+        def score_position(piece):
+            # Feature 4: Single chessman in different columns, the center column has higher value
+            score = sum(weight for weight, cell in zip(weights, cells) if cell == piece)
+
+            # Horizontal, vertical and diagonal windows
+            for getter in geometry.line_getters:
+                score += self.evaluate_window(getter(cells), piece)
+            return score
+
+        score = score_position(piece)
+        opponent_piece = 2 if piece == 1 else 1
+        score -= score_position(opponent_piece)
+        return score
+
+    def evaluate_window(self, window, piece):
+        """
+        Evaluate a window (subset of the board) heuristically.
+        """
+        score = 0
+
+        if window.count(piece) == 4:
+            score += 1000000  # Winning move, no depth factor needed
+        elif window.count(piece) == 3 and window.count(0) == 1:
+            score += 900000  # Potential win in one move
+        elif window.count(piece) == 2 and window.count(0) == 2:
+            score += 50000  # Potential setup for future win
+        elif window.count(piece) == 1 and window.count(0) == 3:
+            score += 10000  # Minimal but positive setup
+
+        return score
+
+class BitboardEvaluator(Evaluator):
+    """
+    Heuristic of MinimaxPlayer2: configurable scores of the occupied cells of every line, computed from row-major
+    bitboards (see Board.get_bitboard). The search stops at full boards as well.
+    """
+    depth_dependent = False
+
+    def __init__(self, win_score=1000000, threat_score=500000, center_score=5, two_in_row_score=20, three_in_row_score=200, block_opponent_score=1500, diagonal_score=350):
+        """
+        Initialize the evaluator with its heuristic scores.
+        """
+        self.win_score = win_score
+        self.threat_score = threat_score
+        self.center_score = center_score
+        self.two_in_row_score = two_in_row_score
+        self.three_in_row_score = three_in_row_score
+        self.block_opponent_score = block_opponent_score
+        self.diagonal_score = diagonal_score
+
+    def is_terminal(self, board):
+        """
+        Check if the search stops at this board: a player has won or the board is full.
+        """
+        return board.is_terminal_node()
+
+    def evaluate(self, board, piece, depth):
+        """
+        Evaluate the board state heuristically using bitboard representation.
+        """
+        player_bitboard = board.get_bitboard(piece)
+        opponent_piece = 2 if piece == 1 else 1
+        opponent_bitboard = board.get_bitboard(opponent_piece)
+        return self.evaluate_bitboard(player_bitboard, opponent_bitboard, board.rows, board.columns)
+
+    def evaluate_bitboard(self, player_bitboard, opponent_bitboard, rows=6, columns=7):
+        """
+        Evaluate the bitboard representation of the board state heuristically.
+        """
+        # Row-major bits of the cells of every line (horizontal, vertical and both diagonals)
+        lines = get_geometry(rows, columns).flat_lines
+
+        def score_position(bitboard, piece_bitboard):
+            score = 0
+            for a, b, c, d in lines:
+                # Window with bit i set if the i-th cell of the line is occupied
+                window = (bitboard >> a & 1) | (bitboard >> b & 1) << 1 | (bitboard >> c & 1) << 2 | (bitboard >> d & 1) << 3
+                score += self.evaluate_window(window, piece_bitboard)
+            return score
+
+        player_score = score_position(player_bitboard, player_bitboard)
+        opponent_score = score_position(opponent_bitboard, opponent_bitboard)
+        return player_score - opponent_score
+
+    def evaluate_window(self, window, piece_bitboard):
+        """
+        Evaluate a window (subset of the bitboard) heuristically.
+        """
+        score = 0
+        opponent_bitboard = ~piece_bitboard
+
+        # Absolute win
+        if window == 0b1111:
+            return self.win_score
+
+        # Three in a row (with one empty spot)
+        if bin(window).count('1') == 3 and bin(window).count('0') == 1:
+            score += self.threat_score
+
+        # Two in a row (with two empty spots)
+        if bin(window).count('1') == 2 and bin(window).count('0') == 2:
+            score += self.two_in_row_score
+
+        # Single piece
+        if bin(window).count('1') == 1:
+            score += self.center_score
+
+        # Blocking opponent's win
+        if bin(opponent_bitboard & window).count('1') == 3 and bin(window).count('0') == 1:
+            score += self.block_opponent_score
+
+        # Specific diagonal threat detection
+        if self.is_diagonal(window):
+            score += self.diagonal_score
+
+        return score
+
+    def is_diagonal(self, window):
+        """
+        Check if a window represents a diagonal threat.
+        """
+        diagonal_patterns = [0b1000, 0b0100, 0b0010, 0b0001]
+        for pattern in diagonal_patterns:
+            if window & pattern == pattern:
+                return True
+        return False
+
+def count_windows(pieces, free, shift):
+    """
+    Classify the windows of four cells in the direction of a bit shift (padded column layout, see Position) that
+    contain only pieces and free cells. Returns bitmasks of the first cells of the windows with four, three, two
+    and one of the pieces. The padding bits are never set, so windows that wrap around a column are never counted.
+    """
+    a, b, c, d = pieces, pieces >> shift, pieces >> 2 * shift, pieces >> 3 * shift
+    usable = pieces | free
+    window = usable & (usable >> shift) & (usable >> 2 * shift) & (usable >> 3 * shift)
+    # Bit-sliced sum of the four cells: ones is the lowest bit of the count, twos the second and fours the third
+    ones = a ^ b
+    twos = a & b
+    twos |= ones & c
+    ones ^= c
+    carry = ones & d
+    ones ^= d
+    fours = twos & carry
+    twos ^= carry
+    return fours, window & ones & twos, window & twos & ~ones & ~fours, window & ones & ~twos
+
+class PaddedBitboardEvaluator(Evaluator):
+    """
+    Heuristic of MinimaxPlayer2 on bitboards in the padded column layout of Position. For every direction, the
+    windows of four cells are classified with a few shifts and ANDs of whole bitboards and counted with
+    int.bit_count, instead of extracting and testing every line. A player scores:
+    win_score per four in a row, threat_score per empty cell that completes four in a row,
+    three_in_row_score per window with three pieces and an empty cell (diagonal_score more on diagonals),
+    two_in_row_score per window with two pieces and two empty cells, center_score per window with one piece and
+    three empty cells (there are most of those windows around the center) and block_opponent_score per window
+    with three opponent pieces blocked by one of the player's pieces. The score of the opponent is subtracted.
+    The bitboards are updated incrementally by the search, so a leaf does not read the NumPy board.
+    """
+    depth_dependent = False
+    incremental = True
+
+    def __init__(self, win_score=1000000, threat_score=500000, center_score=5, two_in_row_score=20, three_in_row_score=200, block_opponent_score=1500, diagonal_score=350):
+        """
+        Initialize the evaluator with its heuristic scores.
+        """
+        self.win_score = win_score
+        self.threat_score = threat_score
+        self.center_score = center_score
+        self.two_in_row_score = two_in_row_score
+        self.three_in_row_score = three_in_row_score
+        self.block_opponent_score = block_opponent_score
+        self.diagonal_score = diagonal_score
+        self.board = None
+        self.pieces = {1: 0, 2: 0}
+
+    def is_terminal(self, board):
+        """
+        Check if the search stops at this board: a player has won or the board is full.
+        """
+        return board.is_terminal_node()
+
+    def bit(self, board, row, col):
+        """
+        Return the bit of a cell of the board in the padded column layout.
+        """
+        return 1 << (col * (board.rows + 1) + board.rows - 1 - row)
+
+    def reset(self, board):
+        """
+        Read the bitboards of both players from the board.
+        """
+        self.board = board
+        self.pieces = {1: 0, 2: 0}
+        for row, cells in enumerate(board.board.tolist()):
+            for col, cell in enumerate(cells):
+                if cell:
+                    self.pieces[int(cell)] |= self.bit(board, row, col)
+
+    def play(self, board, row, col, piece):
+        """
+        Add the piece to the bitboard of its player.
+        """
+        self.pieces[piece] |= self.bit(board, row, col)
+
+    def undo(self, board, row, col, piece):
+        """
+        Remove the piece from the bitboard of its player.
+        """
+        self.pieces[piece] &= ~self.bit(board, row, col)
+
+    def evaluate(self, board, piece, depth):
+        """
+        Evaluate the board from the point of view of the piece, using the bitboards kept since the last reset.
+        """
+        if self.board is not board:
+            self.reset(board)
+        opponent_piece = 2 if piece == 1 else 1
+        return self.evaluate_bitboard(self.pieces[piece], self.pieces[opponent_piece], board.rows, board.columns)
+
+    def evaluate_bitboard(self, player_bitboard, opponent_bitboard, rows=6, columns=7):
+        """
+        Evaluate the padded column bitboards of the player and the opponent heuristically.
+        """
+        mask = player_bitboard | opponent_bitboard
+        empty = board_masks(rows, columns)[1] ^ mask
+        h = rows + 1
+        score = 0
+        for shift in (1, h, h - 1, h + 1):
+            for pieces, other, sign in ((player_bitboard, opponent_bitboard, 1), (opponent_bitboard, player_bitboard, -1)):
+                fours, threes, twos, ones = count_windows(pieces, empty, shift)
+                threes = threes.bit_count()
+                value = (self.win_score * fours.bit_count() + self.three_in_row_score * threes
+                         + self.two_in_row_score * twos.bit_count() + self.center_score * ones.bit_count())
+                if shift != 1 and shift != h:
+                    value += self.diagonal_score * threes
+                # Threes of the other player blocked by one of these pieces
+                value += self.block_opponent_score * count_windows(other, pieces, shift)[1].bit_count()
+                score += sign * value
+        score += self.threat_score * (winning_cells(player_bitboard, mask, rows, columns).bit_count()
+                                      - winning_cells(opponent_bitboard, mask, rows, columns).bit_count())
+        return score
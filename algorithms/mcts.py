@@ -2,10 +2,17 @@
 This file defines the Monte Carlo Tree Search (MCTS) algorithm for the Connect 4 game.
 It includes the MCTSNode class, which represents a node in the MCTS tree, and the MCTSPlayer class,
 which implements the MCTS algorithm to select the best move for the player.
+The MCTSSolverPlayer class extends plain UCT with MCTS-Solver: terminal and proven nodes are marked
+and proven wins and losses are propagated up the tree, so decided branches are no longer sampled.
+It optionally uses RAVE (all-moves-as-first statistics) to speed up convergence with few iterations.
 """
 
 import random
 import math
+import time
+from game.player import Player
+from algorithms.stats import record_stats
+from algorithms import opening_book
 
 class MCTSNode:
     def __init__(self, board, parent=None, move=None):
@@ -42,15 +49,17 @@ class MCTSNode:
         self.visits += 1
         self.wins += result
 
-class MCTSPlayer:
-    def __init__(self, name, piece, iterations=1000):
+class MCTSPlayer(Player):
+    def __init__(self, name, piece, iterations=1000, time_limit=None):
         """
         Initialize a Monte Carlo Tree Search (MCTS) player.
+        If time_limit (in seconds) is given, the search also stops once the time is used up.
         """
-        self.name = name
-        self.piece = piece
+        super().__init__(name, piece)
         self.iterations = iterations
+        self.time_limit = time_limit
 
+    @record_stats
     def get_move(self, board, sequence):
         """
         Get the best move for the player using the MCTS algorithm.
@@ -58,29 +67,40 @@ class MCTSPlayer:
         root = MCTSNode(board)
         turn = board.get_move_count()
         if turn == 0:
+            self.last_stats.book = True
             return 3
         elif turn <= 5:
             last_digit = self.binary_search_ignore_last_digit(f'Possible_Moves/moves_{turn}.txt', sequence)
             if last_digit > 0 and last_digit < 8:
+                self.last_stats.book = True
                 return last_digit - 1
             
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
         for _ in range(self.iterations):
+            if deadline is not None and root.children and time.perf_counter() >= deadline:
+                break
+            self.check_stop()
             node = root
             state = board.copy()
 
             # Select
+            depth = 0
             while node.untried_moves == [] and node.children != []:
                 node = node.select_child()
                 state.apply_move(node.move, self.piece if state.get_next_open_row(node.move) % 2 == 0 else 1 if self.piece == 2 else 2)
+                depth += 1
+            self.last_stats.depth = max(self.last_stats.depth, depth)
 
             # Expand
             if node.untried_moves:
                 move = random.choice(node.untried_moves)
                 state.apply_move(move, self.piece if state.get_next_open_row(move) % 2 == 0 else 1 if self.piece == 2 else 2)
                 node = node.add_child(move, state)
+                self.last_stats.nodes += 1
 
             # Simulate
             piece = self.piece
+            self.last_stats.leaf_evaluations += 1
             while not state.is_terminal_node():
                 state.apply_move(random.choice(state.get_legal_moves()), piece)
                 piece = 1 if piece == 2 else 2
@@ -91,30 +111,241 @@ class MCTSPlayer:
                 node.update(result)
                 node = node.parent
 
-        return sorted(root.children, key=lambda c: c.visits)[-1].move
+        best = sorted(root.children, key=lambda c: c.visits)[-1]
+        self.last_stats.score = best.wins / best.visits
+        return best.move
     
     def binary_search_ignore_last_digit(self, filename, target):
         """
-        Perform a binary search on a sorted file of numbers, ignoring the last digit of each number during comparison.
-        """
-        with open(filename, 'r') as file:
-            lines = [line.strip() for line in file.readlines()]
-            try:
-                numbers = [int(line) for line in lines]
-            except:
-                return -1
-            target_int = int(target)  
-            left, right = 0, len(numbers) - 1
-
-            while left <= right:
-                mid = (left + right) // 2
-                mid_value = numbers[mid] // 10  
-
-                if mid_value == target_int:
-                    last_digit = numbers[mid] % 10
-                    return last_digit  
-                elif mid_value < target_int:
-                    left = mid + 1
-                else:
-                    right = mid - 1
-            return -1
+        Look up the best move for a sequence in an opening book file (cached in memory, see opening_book.py).
+        """
+        return opening_book.binary_search_ignore_last_digit(filename, target)
+
+
+# Proven values of an MCTSSolverNode, seen from the player who made the move leading to the node
+PROVEN_WIN = 1
+PROVEN_DRAW = 0
+PROVEN_LOSS = -1
+
+class MCTSSolverNode:
+    def __init__(self, parent=None, move=None, piece=None, row=None):
+        """
+        Initialize an MCTS-Solver node. The node does not store a board, the state is replayed
+        from the root during selection. Wins are counted for the piece that moved into this node.
+        """
+        self.parent = parent
+        self.move = move
+        self.piece = piece
+        self.row = row
+        self.wins = 0
+        self.visits = 0
+        self.amaf_wins = 0
+        self.amaf_visits = 0
+        self.children = []
+        self.untried_moves = None
+        self.proven = None
+
+    def select_child(self, exploration, rave_equivalence=0):
+        """
+        Select the child with the highest UCT value, skipping children that are proven losses for the player to move.
+        With a positive rave_equivalence the win rate is blended with the child's AMAF win rate,
+        using a weight that decays as the child collects real visits.
+        """
+        candidates = [c for c in self.children if c.proven != PROVEN_LOSS] or self.children
+        log_visits = math.log(self.visits)
+
+        def uct(c):
+            value = c.wins / c.visits
+            if rave_equivalence and c.amaf_visits:
+                beta = math.sqrt(rave_equivalence / (3 * c.visits + rave_equivalence))
+                value = (1 - beta) * value + beta * c.amaf_wins / c.amaf_visits
+            return value + exploration * math.sqrt(log_visits / c.visits)
+
+        return max(candidates, key=uct)
+
+    def add_child(self, move, piece, row):
+        """
+        Add a child node for the given move played by the given piece into the given row.
+        """
+        child = MCTSSolverNode(parent=self, move=move, piece=piece, row=row)
+        self.untried_moves.remove(move)
+        self.children.append(child)
+        return child
+
+    def update(self, winner):
+        """
+        Update the node's visit count and win count. A draw counts as half a win for both sides.
+        """
+        self.visits += 1
+        if winner == self.piece:
+            self.wins += 1
+        elif winner == 0:
+            self.wins += 0.5
+
+    def update_amaf(self, winner):
+        """
+        Update the node's all-moves-as-first statistics.
+        """
+        self.amaf_visits += 1
+        if winner == self.piece:
+            self.amaf_wins += 1
+        elif winner == 0:
+            self.amaf_wins += 0.5
+
+    def update_proven(self):
+        """
+        Try to prove this node from its children using the negamax rule.
+        Returns True if the node has been proven.
+        """
+        if any(c.proven == PROVEN_WIN for c in self.children):
+            self.proven = PROVEN_LOSS
+        elif not self.untried_moves and self.children and all(c.proven is not None for c in self.children):
+            self.proven = -max(c.proven for c in self.children)
+        return self.proven is not None
+
+class MCTSSolverPlayer(MCTSPlayer):
+    """
+    MCTSSolverPlayer implements MCTS-Solver. Rewards are backed up from the perspective of the player
+    who moved into each node, draws count as half a win, and immediate wins are expanded first so that
+    won and lost positions are proven instead of sampled.
+    With rave=True, every (column, height) move seen during an iteration also updates the AMAF
+    statistics of the matching sibling nodes, which are blended into UCT while visits are low.
+    """
+    def __init__(self, name, piece, iterations=1000, exploration=math.sqrt(2), rave=False, rave_equivalence=300, time_limit=None):
+        """
+        Initialize the MCTS-Solver player with a name, piece, iteration budget and UCT exploration constant.
+        rave_equivalence is the number of visits at which real and AMAF statistics are weighted equally.
+        If time_limit (in seconds) is given, the search also stops once the time is used up.
+        """
+        super().__init__(name, piece, iterations, time_limit)
+        self.exploration = exploration
+        self.rave = rave
+        self.rave_equivalence = rave_equivalence
+
+    @record_stats
+    def get_move(self, board, sequence):
+        """
+        Get the best move for the player using MCTS-Solver.
+        """
+        turn = board.get_move_count()
+        if turn == 0:
+            self.last_stats.book = True
+            return 3
+        elif turn <= 5:
+            last_digit = self.binary_search_ignore_last_digit(f'Possible_Moves/moves_{turn}.txt', sequence)
+            if last_digit > 0 and last_digit < 8:
+                self.last_stats.book = True
+                return last_digit - 1
+
+        opponent_piece = 2 if self.piece == 1 else 1
+        root = MCTSSolverNode(piece=opponent_piece)
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+
+        for _ in range(self.iterations):
+            if root.proven is not None:
+                break
+            if deadline is not None and root.children and time.perf_counter() >= deadline:
+                break
+            self.check_stop()
+            node = root
+            state = board.copy()
+            played = [] if self.rave else None
+
+            # Select
+            depth = 0
+            while node.proven is None and node.untried_moves == [] and node.children:
+                node = node.select_child(self.exploration, self.rave_equivalence if self.rave else 0)
+                state.drop_piece(node.move, node.piece)
+                depth += 1
+            self.last_stats.depth = max(self.last_stats.depth, depth)
+
+            # Expand
+            if node.proven is None:
+                if node.untried_moves is None:
+                    node.untried_moves = self.order_moves(state, 2 if node.piece == 1 else 1)
+                if node.untried_moves:
+                    move = node.untried_moves[-1]
+                    row = state.get_next_open_row(move)
+                    node = node.add_child(move, 2 if node.piece == 1 else 1, row)
+                    state.drop_piece(move, node.piece)
+                    self.last_stats.nodes += 1
+                    if state.check_winner_at(row, move, node.piece):
+                        node.proven = PROVEN_WIN
+                    elif state.check_draw():
+                        node.proven = PROVEN_DRAW
+
+            # Simulate
+            if node.proven is None:
+                self.last_stats.leaf_evaluations += 1
+                winner = self.simulate(state, 2 if node.piece == 1 else 1, played)
+            elif node.proven == PROVEN_WIN:
+                winner = node.piece
+            elif node.proven == PROVEN_LOSS:
+                winner = 2 if node.piece == 1 else 1
+            else:
+                winner = 0
+
+            # Backpropagate
+            proving = node.proven is not None
+            seen = set(played) if self.rave else None
+            while node is not None:
+                node.update(winner)
+                if self.rave:
+                    # Credit every sibling whose (row, column) was later played by the same piece
+                    for child in node.children:
+                        if (child.row, child.move, child.piece) in seen:
+                            child.update_amaf(winner)
+                    if node.parent is not None:
+                        seen.add((node.row, node.move, node.piece))
+                if proving and node.parent is not None:
+                    proving = node.parent.update_proven()
+                node = node.parent
+
+        return self.select_final_move(root)
+
+    def order_moves(self, state, piece):
+        """
+        Return the legal moves in expansion order. Moves are expanded from the end of the list,
+        so immediate wins for the given piece are placed last and the rest is shuffled.
+        """
+        moves = state.get_legal_moves()
+        random.shuffle(moves)
+        winning = []
+        for col in moves:
+            row = state.get_next_open_row(col)
+            state.board[row][col] = piece
+            if state.check_winner_at(row, col, piece):
+                winning.append(col)
+            state.board[row][col] = 0
+        return [col for col in moves if col not in winning] + winning
+
+    def simulate(self, state, piece, played=None):
+        """
+        Play random moves until the game ends and return the winning piece, or 0 for a draw.
+        If a list is given, the (row, column, piece) of every move is appended to it.
+        """
+        while True:
+            moves = state.get_legal_moves()
+            if not moves:
+                return 0
+            col = random.choice(moves)
+            row, _ = state.drop_piece(col, piece)
+            if played is not None:
+                played.append((row, col, piece))
+            if state.check_winner_at(row, col, piece):
+                return piece
+            piece = 2 if piece == 1 else 1
+
+    def select_final_move(self, root):
+        """
+        Select the move to play: a proven win if there is one, otherwise the most visited
+        child that is not a proven loss.
+        """
+        for child in root.children:
+            if child.proven == PROVEN_WIN:
+                self.last_stats.score = 1.0
+                return child.move
+        candidates = [c for c in root.children if c.proven != PROVEN_LOSS] or root.children
+        best = max(candidates, key=lambda c: c.visits)
+        self.last_stats.score = best.wins / best.visits
+        return best.move
@@ -0,0 +1,38 @@
+"""
+This file defines the access to the opening book in Possible_Moves. Every book file is read and parsed only once
+per process and then kept in memory, so looking up a book move no longer reads a file on every call.
+Relative file names are resolved against the project directory, independent of the working directory.
+"""
+
+import functools
+import os
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOOK_TURNS = range(1, 6)
+
+@functools.lru_cache(maxsize=None)
+def load_book(filename):
+    """
+    Load a sorted book file of numbers, where each number is a move sequence followed by the best move as last digit.
+    Returns a dictionary from sequence to best move, or an empty dictionary if the file cannot be parsed.
+    """
+    with open(os.path.join(PROJECT_DIR, filename), 'r') as file:
+        try:
+            numbers = [int(line.strip()) for line in file]
+        except ValueError:
+            return {}
+    return {number // 10: number % 10 for number in numbers}
+
+def binary_search_ignore_last_digit(filename, target):
+    """
+    Look up a move sequence in a book file, ignoring the last digit of each number during comparison.
+    Returns the last digit (the best move as 1-indexed column) or -1 if the sequence is not in the book.
+    """
+    return load_book(filename).get(int(target), -1)
+
+def warm_up():
+    """
+    Load all book files, e.g. when a worker process starts.
+    """
+    for turn in BOOK_TURNS:
+        load_book(f'Possible_Moves/moves_{turn}.txt')
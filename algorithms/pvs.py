@@ -0,0 +1,372 @@
+"""
+This file defines the PVSearch mixin, the negamax principal variation search (PVS) of SearchEngine.
+The first move of every node is searched with the full window, all further moves with a null window that only
+proves they are not better; a move that turns out better is searched again with the full window. The root is
+searched with iterative deepening: every iteration searches the best move of the previous one first, and its
+window (the aspiration window) is centered on the previous score. If the score falls outside the window, the
+iteration is repeated with that side of the window opened.
+With self.threats set, every node is checked with the threat analysis of threats.py: decided positions are not
+searched further, an immediate threat of the opponent must be stopped and the other moves are ordered by the
+threats they create. With self.symmetry, only the left half (and the center column) of a symmetric position is
+searched, since the other moves lead to the mirror images of the same positions. With self.batch, the children
+of the nodes at depth 1 are evaluated together (see search_frontier). The search depth is selective: with
+self.reductions, late quiet moves are first searched one ply shallower and only searched again at full depth if
+they turn out better than the best move so far, and with self.extensions, moves near the horizon that create or
+stop an immediate threat are searched one ply deeper. Leaf scores are kept in the player's evaluation cache, if
+it has one. Once few cells remain, the players skip the heuristic search and solve the position exactly
+(see solve_endgame).
+
+A player using the mixin sets self.evaluator (see evaluators.py), self.depth, self.aspiration_window,
+self.threats, self.symmetry, self.batch, self.reductions, self.extensions, self.endgame_threshold and
+self.eval_cache.
+"""
+
+from game.position import Position, is_symmetric
+from game.player import SearchCancelled
+from algorithms.solver import Solver
+from algorithms.threats import Threats, board_masks, column_mask, has_won, order_moves, playable_cells, winning_cells
+
+INF = float('inf')
+
+# Score of a position that is won by the threat analysis, multiplied by the remaining depth (+ 1 to 3) so that
+# faster wins score higher. It exceeds every heuristic score.
+WIN_SCORE = 10 ** 30
+
+# Late move reductions: at nodes with a remaining depth of at least REDUCTION_DEPTH, the quiet moves after the
+# first LATE_MOVES moves are searched one ply shallower first
+LATE_MOVES = 2
+REDUCTION_DEPTH = 2
+
+# Threatening moves are only extended at nodes with a remaining depth of at most EXTENSION_DEPTH, where the
+# threat would otherwise be cut off by the horizon. Extending them everywhere triples the size of the tree.
+EXTENSION_DEPTH = 2
+
+def center_order(columns):
+    """
+    Return the columns ordered from the center outwards (3, 2, 4, 1, 5, 0, 6 on a standard board).
+    """
+    return sorted(range(columns), key=lambda col: abs(col - columns // 2))
+
+class PVSearch:
+    # Exact solver of the endgame, created on first use
+    solver = None
+
+    def evaluate_position(self, board, depth):
+        """
+        Evaluate a leaf from the point of view of this player. depth is the remaining search depth.
+        """
+        return self.evaluator.evaluate(board, self.piece, depth)
+
+    def is_terminal(self, board):
+        """
+        Check if the search stops at this board regardless of the remaining depth.
+        """
+        return self.evaluator.is_terminal(board)
+
+    def start_search(self, board):
+        """
+        Prepare the evaluator for a search from the board.
+        """
+        if self.evaluator.incremental:
+            self.evaluator.reset(board)
+
+    def play(self, board, col, piece):
+        """
+        Drop the piece into the column of the board and return its row.
+        """
+        row, _ = board.drop_piece(col, piece)
+        if self.evaluator.incremental:
+            self.evaluator.play(board, row, col, piece)
+        return row
+
+    def undo(self, board, row, col, piece):
+        """
+        Remove the piece played with play from the board.
+        """
+        if self.evaluator.incremental:
+            self.evaluator.undo(board, row, col, piece)
+        board.board[row][col] = 0
+
+    def negamax(self, board, depth, alpha, beta, piece, current, mask, extended=0):
+        """
+        Principal variation search. Returns the score from the point of view of the player with the given piece,
+        who is to move. Scores outside (alpha, beta) are bounds (fail-soft). current holds the pieces of the
+        player to move and mask all pieces, as bitboards in the layout of Position. extended is the number of
+        extensions on the path from the root.
+        """
+        self.last_stats.nodes += 1
+        self.check_stop()
+        rows, columns = board.rows, board.columns
+        moves = [col for col in center_order(columns) if board.is_valid_move(col)]
+        if self.symmetry and is_symmetric(current, mask, rows, columns):
+            moves = [col for col in moves if col <= (columns - 1) // 2]
+        if self.threats:
+            value, moves = self.check_threats(current, mask, piece, depth, moves, rows, columns)
+            if value is not None:
+                self.last_stats.threat_cutoffs += 1
+                return value
+            terminal = not moves
+        else:
+            terminal = not moves or self.is_terminal(board)
+        if depth == 0 or terminal:
+            self.last_stats.leaf_evaluations += 1
+            value = self.evaluate_leaf(board, depth, piece, current, mask)
+            return value if piece == self.piece else -value
+        if depth == 1 and self.batch:
+            return self.search_frontier(board, alpha, beta, piece, current, mask, moves)
+
+        opponent_piece = 2 if piece == 1 else 1
+        tactical = ()
+        if depth >= 2 and (self.reductions or self.extensions):
+            tactical = self.tactical_moves(current, mask, moves, rows, columns)
+        best_value = -INF
+        for index, col in enumerate(moves):
+            row = self.play(board, col, piece)
+            child_current, child_mask = current ^ mask, mask | (mask + (1 << col * (rows + 1)))
+            child_depth, child_extended = depth - 1, extended
+            if self.extensions and col in tactical and depth <= EXTENSION_DEPTH and extended < self.depth:
+                self.last_stats.extensions += 1
+                child_depth, child_extended = depth, extended + 1
+            args = (opponent_piece, child_current, child_mask, child_extended)
+            try:
+                if index == 0:
+                    value = -self.negamax(board, child_depth, -beta, -alpha, *args)
+                else:
+                    full_search = True
+                    if self.reductions and index >= LATE_MOVES and depth >= REDUCTION_DEPTH and col not in tactical:
+                        # Late quiet move: a reduced search only has to show that it is not better
+                        self.last_stats.reductions += 1
+                        value = -self.negamax(board, child_depth - 1, -alpha - 1, -alpha, *args)
+                        full_search = value > alpha
+                    if full_search:
+                        value = -self.negamax(board, child_depth, -alpha - 1, -alpha, *args)
+                        if alpha < value < beta:
+                            self.last_stats.researches += 1
+                            value = -self.negamax(board, child_depth, -beta, -alpha, *args)
+            finally:
+                # Also taken back when the search is cancelled, so that the board and evaluator stay consistent
+                self.undo(board, row, col, piece)
+            if value > best_value:
+                best_value = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        self.last_stats.cutoffs += 1
+                        break
+        return best_value
+
+    def tactical_moves(self, current, mask, moves, rows, columns):
+        """
+        Return the set of moves that create an immediate threat of the player to move or stop one of the opponent.
+        """
+        bottom = board_masks(rows, columns)[0]
+        opponent_threats = winning_cells(current ^ mask, mask, rows, columns) & playable_cells(mask, rows, columns)
+        tactical = set()
+        for col in moves:
+            move = (mask + bottom) & column_mask(col, rows)
+            if move & opponent_threats or (winning_cells(current | move, mask | move, rows, columns)
+                                           & playable_cells(mask | move, rows, columns)):
+                tactical.add(col)
+        return tactical
+
+    def leaf_key(self, current, mask, piece, depth):
+        """
+        Key of a leaf in the evaluation cache: the position (independent of the player to move, who follows from
+        the number of pieces) and the remaining depth if the evaluator depends on it.
+        """
+        player_one = current if piece == 1 else current ^ mask
+        return (player_one + mask) * 64 + (depth if self.evaluator.depth_dependent else 0)
+
+    def evaluate_leaf(self, board, depth, piece, current, mask):
+        """
+        Evaluate a leaf with evaluate_position, through the evaluation cache if the player has one.
+        """
+        if self.eval_cache is None:
+            return self.evaluate_position(board, depth)
+        key = self.leaf_key(current, mask, piece, depth)
+        value = self.eval_cache.get(key)
+        if value is None:
+            value = self.evaluate_position(board, depth)
+            self.eval_cache.put(key, value)
+        else:
+            self.last_stats.eval_hits += 1
+        return value
+
+    def check_threats(self, current, mask, piece, depth, moves, rows, columns):
+        """
+        Apply the threat analysis to a node. Returns the score of a statically decided position (None otherwise):
+        the previous move won, the player to move wins or cannot stop the opponent from winning. Also returns the
+        moves left to search, ordered by the threats they create.
+        """
+        if has_won(current ^ mask, rows):
+            return -WIN_SCORE * (depth + 3), moves
+        if moves:
+            threats = Threats(current, mask, rows, columns)
+            if threats.can_win():
+                return WIN_SCORE * (depth + 2), moves
+            moves = threats.filter_moves(moves)
+            if not moves:
+                # Every move lets the opponent win with the next move
+                return -WIN_SCORE * (depth + 1), moves
+            if depth > 0 and len(moves) > 1:
+                moves = order_moves(current, mask, moves, rows, columns)
+        return None, moves
+
+    def search_frontier(self, board, alpha, beta, piece, current, mask, moves):
+        """
+        Search a node at depth 1. The heuristic scores of all children that are not statically decided are
+        computed in one batch (see WindowEvaluator.evaluate_batch), then the children are consumed in move order.
+        """
+        rows, columns = board.rows, board.columns
+        h = rows + 1
+        opponent_piece = 2 if piece == 1 else 1
+        values, leaves, leaf_moves = [], [], []
+        for col in moves:
+            child_current, child_mask = current ^ mask, mask | (mask + (1 << col * h))
+            value = None
+            if self.threats:
+                child_moves = [c for c in range(columns) if not child_mask >> (c * h + rows - 1) & 1]
+                value, _ = self.check_threats(child_current, child_mask, opponent_piece, 0, child_moves, rows, columns)
+                if value is not None:
+                    self.last_stats.threat_cutoffs += 1
+            if value is None:
+                self.last_stats.leaf_evaluations += 1
+                key = self.leaf_key(child_current, child_mask, opponent_piece, 0)
+                value = self.eval_cache.get(key) if self.eval_cache is not None else None
+                if value is None:
+                    height = bin(mask >> (col * h) & ((1 << rows) - 1)).count('1')
+                    leaves.append((len(values), key))
+                    leaf_moves.append((rows - 1 - height, col))
+                else:
+                    self.last_stats.eval_hits += 1
+                    value = value if opponent_piece == self.piece else -value
+            values.append(value)
+        if leaves:
+            scores = self.evaluator.evaluate_batch(board, piece, leaf_moves, self.piece, 0)
+            for (index, key), score in zip(leaves, scores):
+                if self.eval_cache is not None:
+                    self.eval_cache.put(key, score)
+                values[index] = score if opponent_piece == self.piece else -score
+        self.last_stats.nodes += len(moves)
+
+        best_value = -INF
+        for value in values:
+            value = -value
+            if value > best_value:
+                best_value = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        self.last_stats.cutoffs += 1
+                        break
+        return best_value
+
+    def search_root(self, board, depth, alpha, beta, moves, position):
+        """
+        Search the moves of the root in the given order. Returns the best score and move.
+        """
+        opponent_piece = 2 if self.piece == 1 else 1
+        best_value, best_move = -INF, moves[0]
+        for index, col in enumerate(moves):
+            row = self.play(board, col, self.piece)
+            child = position.copy()
+            child.play(col)
+            try:
+                if index == 0:
+                    value = -self.negamax(board, depth - 1, -beta, -alpha, opponent_piece, child.current, child.mask)
+                else:
+                    value = -self.negamax(board, depth - 1, -alpha - 1, -alpha, opponent_piece, child.current, child.mask)
+                    if alpha < value < beta:
+                        self.last_stats.researches += 1
+                        value = -self.negamax(board, depth - 1, -beta, -alpha, opponent_piece, child.current, child.mask)
+            finally:
+                self.undo(board, row, col, self.piece)
+            if value > best_value:
+                best_value, best_move = value, col
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        return best_value, best_move
+
+    def root_moves(self, board):
+        """
+        Return the valid columns of the root in ascending order, only the left half and the center if the position is
+        symmetric and self.symmetry is set. With self.threats, only a winning column is
+        returned if there is one, otherwise the columns that do not let the opponent win with the next move
+        (all valid columns if every move loses).
+        """
+        moves = [col for col in range(board.columns) if board.is_valid_move(col)]
+        position = Position.from_board(board, self.piece)
+        if self.symmetry and position.is_symmetric():
+            moves = [col for col in moves if col <= (board.columns - 1) // 2]
+        if not self.threats or not moves:
+            return moves
+        threats = Threats(position.current, position.mask, board.rows, board.columns)
+        if threats.can_win():
+            return [col for col in moves if threats.own_immediate & column_mask(col, board.rows)][:1]
+        return threats.filter_moves(moves) or moves
+
+    def pvs_move(self, board, moves):
+        """
+        Find the best of the given moves with iterative deepening up to self.depth and aspiration windows.
+        If the search is stopped (see Player.check_stop), the best move of the last completed iteration is returned
+        and last_stats.cancelled is set; SearchCancelled is only raised if no iteration was completed. Either way the
+        moves of the interrupted line are taken back from the board.
+        """
+        position = Position.from_board(board, self.piece)
+        moves = [col for col in center_order(board.columns) if col in moves]
+        if self.threats:
+            moves = order_moves(position.current, position.mask, moves, board.rows, board.columns)
+        value, best_move, completed = None, None, 0
+        try:
+            for depth in range(1, max(self.depth, 1) + 1):
+                if value is None or not self.aspiration_window:
+                    alpha, beta = -INF, INF
+                else:
+                    alpha, beta = value - self.aspiration_window, value + self.aspiration_window
+                while True:
+                    iteration_value, move = self.search_root(board, depth, alpha, beta, moves, position)
+                    if iteration_value <= alpha and alpha > -INF:
+                        alpha = -INF  # Fail low: the score is below the window
+                    elif iteration_value >= beta and beta < INF:
+                        beta = INF  # Fail high: the score is above the window
+                    else:
+                        break
+                    self.last_stats.researches += 1
+                value, best_move, completed = iteration_value, move, depth
+                moves.remove(best_move)
+                moves.insert(0, best_move)
+        except SearchCancelled:
+            if best_move is None:
+                raise
+            self.last_stats.cancelled = True
+        self.last_stats.depth = completed
+        self.last_stats.score = value
+        return best_move
+
+    def in_endgame(self, board):
+        """
+        Check if the number of empty cells is at most the endgame threshold, so that the position is solved exactly.
+        """
+        return bool(self.endgame_threshold) and board.rows * board.columns - board.get_move_count() <= self.endgame_threshold
+
+    def solve_endgame(self, board):
+        """
+        Play the move with the best proven result (win as fast as possible, lose as late as possible) using the
+        exact solver. The solver's transposition table is kept between moves.
+        """
+        if self.solver is None:
+            self.solver = Solver(board.rows, board.columns)
+        position = Position.from_board(board, self.piece)
+        self.solver.nodes = self.solver.tt_hits = 0
+        self.solver.stop_event = self.stop_event
+        scores = self.solver.analyze(position)
+        best = max((col for col in range(board.columns) if scores[col] is not None),
+                   key=lambda col: (scores[col], -abs(board.columns // 2 - col)))
+        self.last_stats.nodes = self.solver.nodes
+        self.last_stats.tt_hits = self.solver.tt_hits
+        self.last_stats.depth = board.rows * board.columns - position.moves
+        self.last_stats.score = scores[best]
+        self.last_stats.solved = True
+        return best
@@ -0,0 +1,170 @@
+"""
+This file defines a persistent cache of computed moves, shared across games and restarts.
+Positions are keyed canonically: the bitboard key from the point of view of the player to move, folded with its
+left-right mirror image, so that a position and its mirror share one entry (the move is mirrored back on lookup).
+Together with the engine configuration this forms the cache key.
+The cache has two tiers: an in-memory LRU dictionary and an optional SQLite database, which is loaded into the
+LRU tier on startup and to which new results are written in batches.
+The CachedPlayer class puts the cache in front of any engine.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from game.player import Player
+from game.position import Position
+from algorithms.stats import SearchStats
+
+def canonical_key(board, piece):
+    """
+    Return (key, mirrored) of the board with piece to move. mirrored is True if the key is the one
+    of the mirrored position, in which case stored moves have to be mirrored too.
+    """
+    return Position.from_board(board, piece).canonical_key()
+
+def primitive_settings(obj, exclude=()):
+    """
+    Return the numeric, string and boolean attributes of an object as a sorted list of (name, value).
+    """
+    return sorted((name, value) for name, value in vars(obj).items()
+                  if name not in exclude and isinstance(value, (bool, int, float, str)))
+
+def engine_config(player):
+    """
+    Describe the configuration of an engine by its class and its numeric, string and boolean settings,
+    including the class and settings of its evaluator (see evaluators.py) if it has one.
+    """
+    settings = primitive_settings(player, ("name", "piece"))
+    evaluator = getattr(player, "evaluator", None)
+    if evaluator is not None:
+        settings.append(("evaluator", type(evaluator).__name__, primitive_settings(evaluator)))
+    return type(player).__name__ + repr(settings)
+
+class ResultCache:
+    def __init__(self, path=None, capacity=100000, flush_interval=5.0, flush_size=100):
+        """
+        Initialize the cache with at most capacity entries in memory. If a path is given, the SQLite database
+        at this path is opened (and created if needed), and its most recent entries warm up the memory tier.
+        Pending writes are flushed once flush_interval seconds have passed or flush_size results are pending.
+        """
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.entries = OrderedDict()
+        self.pending = []
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.last_flush = time.monotonic()
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self.db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, move INTEGER, score REAL)")
+            self.db.commit()
+            rows = self.db.execute("SELECT key, move, score FROM results ORDER BY rowid DESC LIMIT ?", (capacity,))
+            for key, move, score in reversed(rows.fetchall()):
+                self.entries[key] = (move, score)
+
+    def get(self, key):
+        """
+        Return the cached (move, score) for the key or None. Entries missing in memory are read from the database.
+        """
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None and self.db is not None:
+                row = self.db.execute("SELECT move, score FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = row
+                    self.store(key, value)
+            elif value is not None:
+                self.entries.move_to_end(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key, move, score):
+        """
+        Store a result in memory and queue it for the database.
+        """
+        with self.lock:
+            self.store(key, (move, score))
+            if self.db is not None:
+                self.pending.append((key, move, score))
+                if len(self.pending) >= self.flush_size or time.monotonic() - self.last_flush >= self.flush_interval:
+                    self.write_pending()
+
+    def store(self, key, value):
+        """
+        Insert an entry into the LRU tier and evict the least recently used entries. The lock must be held.
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def write_pending(self):
+        """
+        Write the pending results to the database. The lock must be held.
+        """
+        if self.pending:
+            self.db.executemany("INSERT OR REPLACE INTO results (key, move, score) VALUES (?, ?, ?)", self.pending)
+            self.db.commit()
+            self.pending = []
+        self.last_flush = time.monotonic()
+
+    def flush(self):
+        """
+        Write all pending results to the database.
+        """
+        with self.lock:
+            if self.db is not None:
+                self.write_pending()
+
+    def close(self):
+        """
+        Flush the pending results and close the database.
+        """
+        self.flush()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+class CachedPlayer(Player):
+    """
+    CachedPlayer answers positions it has seen before from a ResultCache and asks the wrapped engine otherwise.
+    """
+    def __init__(self, player, cache, config=None):
+        """
+        Wrap an engine. config identifies the engine settings in the cache keys (default: see engine_config).
+        """
+        super().__init__(player.name, player.piece)
+        self.player = player
+        self.cache = cache
+        self.config = config or engine_config(player)
+
+    def get_move(self, board, sequence):
+        """
+        Get the move for the player from the cache, or from the wrapped engine if the position is not cached.
+        """
+        start = time.perf_counter_ns()
+        key, mirrored = canonical_key(board, self.piece)
+        key = f"{self.config}:{key}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            move, score = cached
+            self.last_stats = SearchStats()
+            self.last_stats.score = score
+            self.last_stats.cached = True
+            self.last_stats.elapsed_ns = time.perf_counter_ns() - start
+            return board.columns - 1 - move if mirrored else move
+
+        self.player.stop_event = self.stop_event
+        move = self.player.get_move(board, sequence)
+        self.last_stats = self.player.last_stats
+        score = self.last_stats.score
+        self.cache.put(key, board.columns - 1 - move if mirrored else move, score if isinstance(score, (int, float)) else None)
+        return move
@@ -0,0 +1,144 @@
+"""
+This file defines the SearchEngine class, the search shared by all Minimax players. The players only differ in
+their evaluator (see evaluators.py) and default settings, so the opening book, the endgame solver, the principal
+variation search of pvs.py with its threat analysis, symmetry pruning, batched frontier and evaluation cache, the
+original alpha-beta search and the search statistics apply to every heuristic.
+"""
+
+import random
+
+from game.player import Player
+from algorithms.stats import record_stats
+from algorithms import opening_book
+from algorithms.pvs import PVSearch
+from algorithms.eval_cache import EvalCache
+
+def check_search(search):
+    """
+    Validate the name of a search algorithm of the Minimax players.
+    """
+    if search not in ("pvs", "alphabeta"):
+        raise ValueError(f"Unknown search: {search}")
+    return search
+
+class SearchEngine(PVSearch, Player):
+    """
+    SearchEngine finds moves with a heuristic search of the game tree, scoring the leaves with an evaluator.
+    """
+    def __init__(self, name, piece, evaluator, depth=5, search="pvs", aspiration_window=50000, threats=True, symmetry=True, endgame_threshold=16, eval_cache_size=1 << 16, batch=True, reductions=True, extensions=False, book_turns=5):
+        """
+        Initialize the engine with a name, piece, evaluator and search depth.
+        search selects the principal variation search ("pvs", see pvs.py) or the plain alpha-beta search ("alphabeta").
+        threats enables the threat analysis in the principal variation search (see threats.py), symmetry the
+        pruning of mirrored moves in symmetric positions.
+        With at most endgame_threshold empty cells the position is solved exactly instead (0 disables this).
+        Leaf scores are cached in an evaluation cache with eval_cache_size entries (0 disables it).
+        batch evaluates the children of the nodes at depth 1 together if the evaluator supports it.
+        reductions enables late move reductions and extensions the extension of threatening moves (see pvs.py).
+        The opening book is used up to move book_turns.
+        """
+        super().__init__(name, piece)
+        self.evaluator = evaluator
+        self.depth = depth
+        self.search = check_search(search)
+        self.aspiration_window = aspiration_window
+        self.threats = threats
+        self.symmetry = symmetry
+        self.endgame_threshold = endgame_threshold
+        self.eval_cache = EvalCache(eval_cache_size) if eval_cache_size else None
+        self.batch = batch and evaluator.evaluate_batch is not None
+        self.reductions = reductions
+        self.extensions = extensions
+        self.book_turns = book_turns
+
+    def minimax(self, board, depth, alpha, beta, maximizingPlayer):
+        """
+        Minimax algorithm with alpha-beta pruning.
+        """
+        self.last_stats.nodes += 1
+        self.check_stop()
+        if depth == 0 or self.is_terminal(board):
+            self.last_stats.leaf_evaluations += 1
+            return self.evaluate_position(board, depth)
+
+        valid_moves = [col for col in range(board.columns) if board.is_valid_move(col)]
+
+        if maximizingPlayer:
+            max_eval = -float('inf')
+            for col in valid_moves:
+                row = self.play(board, col, self.piece)
+                try:
+                    eval = self.minimax(board, depth - 1, alpha, beta, False)
+                finally:
+                    self.undo(board, row, col, self.piece)
+                max_eval = max(max_eval, eval)
+                alpha = max(alpha, eval)
+                if beta <= alpha:
+                    self.last_stats.cutoffs += 1
+                    break  # Beta cut-off
+            return max_eval
+        else:
+            min_eval = float('inf')
+            opponent_piece = 2 if self.piece == 1 else 1
+            for col in valid_moves:
+                row = self.play(board, col, opponent_piece)
+                try:
+                    eval = self.minimax(board, depth - 1, alpha, beta, True)
+                finally:
+                    self.undo(board, row, col, opponent_piece)
+                min_eval = min(min_eval, eval)
+                beta = min(beta, eval)
+                if beta <= alpha:
+                    self.last_stats.cutoffs += 1
+                    break  # Alpha cut-off
+            return min_eval
+
+    @record_stats
+    def get_move(self, board, sequence):
+        """
+        Get the best move for the player: from the opening book, the endgame solver or the search.
+        """
+        turn = board.get_move_count()
+        if turn == 0:
+            self.last_stats.book = True
+            return 3
+        elif turn <= self.book_turns:
+            last_digit = self.binary_search_ignore_last_digit(f'Possible_Moves/moves_{turn}.txt', sequence)
+            if last_digit > 0 and last_digit < 8:
+                self.last_stats.book = True
+                return last_digit - 1
+
+        if self.in_endgame(board):
+            return self.solve_endgame(board)
+        moves = self.root_moves(board)
+        if len(moves) == 1:
+            return moves[0]
+        self.start_search(board)
+        if self.search == "pvs":
+            return self.pvs_move(board, moves)
+        self.last_stats.depth = self.depth
+        best_moves = []
+        best_value = -float('inf')
+        alpha = -float('inf')
+        beta = float('inf')
+        for col in range(board.columns):
+            if col in moves:
+                row = self.play(board, col, self.piece)
+                try:
+                    value = self.minimax(board, self.depth - 1, alpha, beta, False)
+                finally:
+                    self.undo(board, row, col, self.piece)
+                if value > best_value:
+                    best_value = value
+                    best_moves = [col]
+                elif value == best_value:
+                    best_moves.append(col)
+                alpha = max(alpha, value)
+        self.last_stats.score = best_value
+        return random.choice(best_moves)
+
+    def binary_search_ignore_last_digit(self, filename, target):
+        """
+        Look up the best move for a sequence in an opening book file (cached in memory, see opening_book.py).
+        """
+        return opening_book.binary_search_ignore_last_digit(filename, target)
@@ -0,0 +1,219 @@
+"""
+This file implements an exact Connect 4 solver based on negamax with alpha-beta pruning, a transposition table,
+bitboards and null-window searches (following http://blog.gamesolver.org/). Mirrored positions share their
+transposition table entry and symmetric positions are only searched on one side. Scores follow the usual
+convention: a positive score means the player to move wins, the larger the score the sooner, 0 is a draw.
+The SolverPlayer class uses the solver to play perfect moves, which is only practical when few cells remain.
+"""
+
+from game.position import Position, mirror_bits
+from game.player import Player, SearchCancelled
+from algorithms.stats import record_stats
+
+class Solver:
+    def __init__(self, rows=6, columns=7, table_size=1 << 20):
+        """
+        Initialize the solver. table_size limits the number of transposition table entries.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.table_size = table_size
+        self.table = {}
+        self.nodes = 0
+        self.tt_hits = 0
+        self.stop_event = None
+        self.column_order = sorted(range(columns), key=lambda c: abs(columns // 2 - c))
+        self.min_score = -(rows * columns) // 2 + 3
+        self.init_masks()
+
+    def init_masks(self):
+        """
+        Precompute the bitmasks of the board and the bottom row.
+        """
+        h = self.rows + 1
+        self.bottom = sum(1 << (col * h) for col in range(self.columns))
+        self.board_mask = self.bottom * ((1 << self.rows) - 1)
+
+    def reset(self):
+        """
+        Reset the node counter and clear the transposition table.
+        """
+        self.nodes = 0
+        self.tt_hits = 0
+        self.table.clear()
+
+    def winning_positions(self, pieces, mask):
+        """
+        Return a bitmask of all empty cells that would complete four in a row for the given pieces.
+        """
+        h = self.rows + 1
+        # Vertical
+        r = (pieces << 1) & (pieces << 2) & (pieces << 3)
+        for shift in (h, h - 1, h + 1):
+            # Horizontal and both diagonals
+            p = (pieces << shift) & (pieces << 2 * shift)
+            r |= p & (pieces << 3 * shift)
+            r |= p & (pieces >> shift)
+            p = (pieces >> shift) & (pieces >> 2 * shift)
+            r |= p & (pieces << shift)
+            r |= p & (pieces >> 3 * shift)
+        return r & (self.board_mask ^ mask)
+
+    def possible(self, mask):
+        """
+        Return a bitmask of the cells that can be played next.
+        """
+        return (mask + self.bottom) & self.board_mask
+
+    def non_losing_moves(self, current, mask):
+        """
+        Return a bitmask of the playable cells that do not let the opponent win directly.
+        Assumes the player to move cannot win immediately.
+        """
+        possible = self.possible(mask)
+        opponent_win = self.winning_positions(current ^ mask, mask)
+        forced = possible & opponent_win
+        if forced:
+            if forced & (forced - 1):
+                return 0  # The opponent has two immediate threats
+            possible = forced
+        return possible & ~(opponent_win >> 1)
+
+    def can_win_next(self, current, mask):
+        """
+        Check if the player to move can win with the next move.
+        """
+        return self.winning_positions(current, mask) & self.possible(mask) != 0
+
+    def negamax(self, current, mask, moves, alpha, beta):
+        """
+        Negamax search with alpha-beta pruning. Assumes the player to move cannot win immediately.
+        """
+        self.nodes += 1
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchCancelled()
+        size = self.rows * self.columns
+        next_moves = self.non_losing_moves(current, mask)
+        if next_moves == 0:
+            return -((size - moves) // 2)
+        if moves >= size - 2:
+            return 0
+
+        lower = -((size - 2 - moves) // 2)
+        if alpha < lower:
+            alpha = lower
+            if alpha >= beta:
+                return alpha
+
+        upper = (size - 1 - moves) // 2
+        # Mirrored positions share their table entry
+        key = current + mask
+        mirror = mirror_bits(key, self.rows, self.columns)
+        symmetric = mirror == key
+        key = min(key, mirror)
+        value = self.table.get(key)
+        if value is not None:
+            self.tt_hits += 1
+            upper = value + self.min_score - 1
+        if beta > upper:
+            beta = upper
+            if alpha >= beta:
+                return beta
+
+        # Order moves by the number of threats they create, center columns first on ties.
+        # In a symmetric position only the left half (and the center) is searched.
+        h = self.rows + 1
+        ordered = []
+        for col in self.column_order:
+            if symmetric and col > (self.columns - 1) // 2:
+                continue
+            move = next_moves & (((1 << self.rows) - 1) << (col * h))
+            if move:
+                ordered.append((bin(self.winning_positions(current | move, mask)).count('1'), -len(ordered), move))
+        ordered.sort(reverse=True)
+
+        for _, _, move in ordered:
+            score = -self.negamax(current ^ mask, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        if len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[key] = alpha - self.min_score + 1
+        return alpha
+
+    def solve(self, position, weak=False):
+        """
+        Solve a position and return its score. With weak=True only the sign (win/draw/loss) is computed.
+        """
+        size = self.rows * self.columns
+        if self.can_win_next(position.current, position.mask):
+            return 1 if weak else (size + 1 - position.moves) // 2
+        low = -((size - position.moves) // 2)
+        high = (size + 1 - position.moves) // 2
+        if weak:
+            low, high = -1, 1
+        while low < high:
+            med = low + (high - low) // 2
+            if med <= 0 and int(low / 2) < med:
+                med = int(low / 2)
+            elif med >= 0 and int(high / 2) > med:
+                med = int(high / 2)
+            result = self.negamax(position.current, position.mask, position.moves, med, med + 1)
+            if result <= med:
+                high = result
+            else:
+                low = result
+        if weak:
+            return (low > 0) - (low < 0)
+        return low
+
+    def analyze(self, position, weak=False):
+        """
+        Return the score of every column for the player to move (None for full columns).
+        """
+        size = self.rows * self.columns
+        scores = [None] * self.columns
+        symmetric = position.is_symmetric()
+        for col in range(self.columns):
+            if symmetric and col > (self.columns - 1) // 2:
+                scores[col] = scores[self.columns - 1 - col]
+            elif position.can_play(col):
+                if position.is_winning_move(col):
+                    scores[col] = 1 if weak else (size + 1 - position.moves) // 2
+                else:
+                    child = position.copy()
+                    child.play(col)
+                    scores[col] = -self.solve(child, weak)
+        return scores
+
+class SolverPlayer(Player):
+    """
+    SolverPlayer plays perfect moves by solving every column exactly.
+    """
+    def __init__(self, name, piece, weak=False):
+        """
+        Initialize the SolverPlayer with a name and piece. With weak=True only win/draw/loss is distinguished.
+        """
+        super().__init__(name, piece)
+        self.weak = weak
+        self.solver = Solver()
+
+    @record_stats
+    def get_move(self, board, sequence):
+        """
+        Get the best move for the player by solving the position.
+        """
+        position = Position.from_board(board, self.piece)
+        self.solver.nodes = self.solver.tt_hits = 0
+        self.solver.stop_event = self.stop_event
+        scores = self.solver.analyze(position, self.weak)
+        best = max((col for col in range(board.columns) if scores[col] is not None),
+                   key=lambda col: (scores[col], -abs(board.columns // 2 - col)))
+        self.last_stats.nodes = self.solver.nodes
+        self.last_stats.tt_hits = self.solver.tt_hits
+        self.last_stats.depth = board.rows * board.columns - position.moves
+        self.last_stats.score = scores[best]
+        return best
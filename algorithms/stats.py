@@ -0,0 +1,98 @@
+"""
+This file defines the search statistics recorded by the engines for every call to get_move,
+and helper functions to aggregate them into latency percentiles and nodes per second.
+"""
+
+import functools
+import time
+
+class SearchStats:
+    def __init__(self):
+        """
+        Initialize empty statistics for a single move search.
+        """
+        self.nodes = 0
+        self.leaf_evaluations = 0
+        self.cutoffs = 0
+        self.researches = 0
+        self.threat_cutoffs = 0
+        self.reductions = 0
+        self.extensions = 0
+        self.tt_hits = 0
+        self.eval_hits = 0
+        self.depth = 0
+        self.score = None
+        self.book = False
+        self.cached = False
+        self.solved = False
+        self.cancelled = False
+        self.elapsed_ns = 0
+
+    def as_dict(self):
+        """
+        Return the statistics as a dictionary.
+        """
+        return dict(self.__dict__)
+
+def record_stats(get_move):
+    """
+    Decorator for the get_move method of an engine. It creates a fresh SearchStats object as
+    self.last_stats before the search and stores the elapsed time (perf_counter_ns) afterwards.
+    """
+    @functools.wraps(get_move)
+    def wrapper(self, board, *args, **kwargs):
+        self.last_stats = SearchStats()
+        start = time.perf_counter_ns()
+        move = get_move(self, board, *args, **kwargs)
+        self.last_stats.elapsed_ns = time.perf_counter_ns() - start
+        return move
+    return wrapper
+
+def game_phase(ply):
+    """
+    Classify a position by the number of moves already played.
+    """
+    if ply < 12:
+        return "opening"
+    elif ply < 26:
+        return "middlegame"
+    return "endgame"
+
+def percentile(values, p):
+    """
+    Return the p-th percentile of the values using the nearest-rank method.
+    """
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+def summarize(records):
+    """
+    Summarize a list of per-move records (dictionaries with at least elapsed_ns and nodes)
+    into move count, p50/p90/p99 latency in milliseconds and nodes per second.
+    """
+    latencies = [r["elapsed_ns"] for r in records]
+    total_ns = sum(latencies)
+    total_nodes = sum(r["nodes"] for r in records)
+    return {
+        "moves": len(records),
+        "p50_ms": percentile(latencies, 50) / 1e6,
+        "p90_ms": percentile(latencies, 90) / 1e6,
+        "p99_ms": percentile(latencies, 99) / 1e6,
+        "max_ms": max(latencies, default=0) / 1e6,
+        "nodes": total_nodes,
+        "nodes_per_second": total_nodes / (total_ns / 1e9) if total_ns else 0,
+    }
+
+def summarize_by_phase(records):
+    """
+    Summarize per-move records (with a ply entry) overall and for each game phase.
+    """
+    summary = {"all": summarize(records)}
+    for phase in ("opening", "middlegame", "endgame"):
+        phase_records = [r for r in records if game_phase(r["ply"]) == phase]
+        if phase_records:
+            summary[phase] = summarize(phase_records)
+    return summary
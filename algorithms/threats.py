@@ -0,0 +1,139 @@
+"""
+This file defines the threat analysis of a Connect 4 position, computed from bitboards in the padded column layout
+of Position (see position.py). A threat is an empty cell that would complete four in a row for a player.
+A threat is immediate if it can be played right now, and its parity is the parity of its row counted from the
+bottom (1 to 6). In the endgame the first player can usually only realize threats on odd rows and the second
+player threats on even rows (zugzwang), so threats of the right parity are worth much more than the others.
+
+The search uses the analysis (see pvs.py) to stop at positions that are statically decided, to drop moves that let
+the opponent win directly (only the move that stops an immediate threat is left, moves directly below a threat of
+the opponent are skipped) and to search moves that create good threats first.
+"""
+
+import functools
+
+@functools.lru_cache(maxsize=None)
+def board_masks(rows=6, columns=7):
+    """
+    Return the bitmasks (bottom row, all cells, cells on odd rows) of a board size.
+    """
+    h = rows + 1
+    bottom = sum(1 << (col * h) for col in range(columns))
+    board_mask = bottom * ((1 << rows) - 1)
+    odd_rows = bottom * sum(1 << row for row in range(0, rows, 2))
+    return bottom, board_mask, odd_rows
+
+def winning_cells(pieces, mask, rows=6, columns=7):
+    """
+    Return a bitmask of all empty cells that would complete four in a row for the given pieces.
+    """
+    h = rows + 1
+    # Vertical
+    r = (pieces << 1) & (pieces << 2) & (pieces << 3)
+    for shift in (h, h - 1, h + 1):
+        # Horizontal and both diagonals
+        p = (pieces << shift) & (pieces << 2 * shift)
+        r |= p & (pieces << 3 * shift)
+        r |= p & (pieces >> shift)
+        p = (pieces >> shift) & (pieces >> 2 * shift)
+        r |= p & (pieces << shift)
+        r |= p & (pieces >> 3 * shift)
+    return r & (board_masks(rows, columns)[1] ^ mask)
+
+def playable_cells(mask, rows=6, columns=7):
+    """
+    Return a bitmask of the cells that can be played next.
+    """
+    bottom, board_mask, _ = board_masks(rows, columns)
+    return (mask + bottom) & board_mask
+
+def has_won(pieces, rows=6):
+    """
+    Check if the pieces contain four in a row.
+    """
+    h = rows + 1
+    for shift in (1, h - 1, h, h + 1):
+        m = pieces & (pieces >> shift)
+        if m & (m >> (2 * shift)):
+            return True
+    return False
+
+def good_rows(mask, rows=6, columns=7):
+    """
+    Return a bitmask of the rows of the parity the player to move prefers: the odd rows if the player made the
+    first move of the game, i.e. if the number of pieces is even, otherwise the even rows.
+    """
+    _, board_mask, odd_rows = board_masks(rows, columns)
+    return odd_rows if bin(mask).count('1') % 2 == 0 else board_mask ^ odd_rows
+
+def column_mask(col, rows=6):
+    """
+    Return the bitmask of all cells of a column.
+    """
+    return ((1 << rows) - 1) << (col * (rows + 1))
+
+class Threats:
+    def __init__(self, current, mask, rows=6, columns=7):
+        """
+        Analyze the immediate threats of both players. current holds the pieces of the player to move.
+        """
+        self.rows = rows
+        self.playable = playable_cells(mask, rows, columns)
+        self.own = winning_cells(current, mask, rows, columns)
+        self.opponent = winning_cells(current ^ mask, mask, rows, columns)
+        self.own_immediate = self.own & self.playable
+        self.opponent_immediate = self.opponent & self.playable
+
+    def can_win(self):
+        """
+        Check if the player to move can win with the next move.
+        """
+        return self.own_immediate != 0
+
+    def must_lose(self):
+        """
+        Check if the opponent has two immediate threats, of which the player to move can only stop one.
+        Only meaningful if the player to move cannot win with the next move.
+        """
+        return self.opponent_immediate & (self.opponent_immediate - 1) != 0
+
+    def non_losing_moves(self):
+        """
+        Return a bitmask of the playable cells that do not let the opponent win with the next move: the cell that
+        stops the opponent's only immediate threat if there is one, otherwise all cells that are not directly below
+        a threat of the opponent. Only meaningful if the player to move cannot win with the next move.
+        """
+        possible = self.playable
+        if self.opponent_immediate:
+            if self.must_lose():
+                return 0
+            possible = self.opponent_immediate
+        return possible & ~(self.opponent >> 1)
+
+    def filter_moves(self, moves):
+        """
+        Return the columns of moves (in the same order) that do not let the opponent win with the next move.
+        """
+        non_losing = self.non_losing_moves()
+        return [col for col in moves if non_losing & column_mask(col, self.rows)]
+
+def count_cells(bits):
+    """
+    Return the number of cells of a bitmask.
+    """
+    return bin(bits).count('1')
+
+def order_moves(current, mask, moves, rows=6, columns=7):
+    """
+    Order the columns of the player to move: moves creating more threats of the player's parity (see good_rows)
+    first, then moves creating more threats of any parity, the given order (e.g. center first) on ties.
+    """
+    bottom = board_masks(rows, columns)[0]
+    own_parity = good_rows(mask, rows, columns)
+    ranked = []
+    for index, col in enumerate(moves):
+        move = (mask + bottom) & column_mask(col, rows)
+        threats = winning_cells(current | move, mask | move, rows, columns)
+        ranked.append((-count_cells(threats & own_parity), -count_cells(threats), index, col))
+    ranked.sort()
+    return [col for _, _, _, col in ranked]
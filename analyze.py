@@ -0,0 +1,138 @@
+"""
+Batch analysis of positions, e.g. to re-score game logs.
+Move sequences (1-indexed columns, one per line) are read from a file or stdin, evaluated with the chosen engine
+in a process pool and written as CSV rows "sequence,best_move,score,nodes,ms" in input order.
+Only a bounded number of positions is read ahead, so the memory use does not depend on the size of the input.
+If the output file already exists, the positions it contains are skipped and new rows are appended, so an
+interrupted run can be resumed with the same command.
+
+Example:
+    python analyze.py games.txt -e MinimaxPlayer:depth=6 -o scores.csv
+    cat games.txt | python analyze.py -e MCTSSolverPlayer --time-limit 1 > scores.csv
+"""
+import argparse
+import collections
+import contextlib
+import csv
+import io
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.board import Board
+from algorithms.engines import create_engine, get_engine, parse_engine, timed_move
+
+FIELDS = ["sequence", "best_move", "score", "nodes", "ms"]
+
+def analyze_position(sequence, engine, settings, time_limit, seed):
+    """
+    Evaluate one position in a worker process and return its CSV row.
+    Invalid sequences and finished games get a row with empty results.
+    """
+    try:
+        board = Board.from_sequence(sequence)
+    except ValueError:
+        return [sequence, "", "", "", ""]
+    if board.check_winner(1) or board.check_winner(2) or board.check_draw():
+        return [sequence, "", "", "", ""]
+
+    random.seed(seed)
+    player = get_engine(engine, settings, 1 if len(sequence) % 2 == 0 else 2)
+    start = time.perf_counter_ns()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if time_limit is None:
+            move, stats = player.get_move(board, sequence), player.last_stats
+        else:
+            move, stats, _ = timed_move(player, board, sequence, time_limit)
+    elapsed = time.perf_counter_ns() - start
+    score = stats.score
+    if score is None or isinstance(score, float) and not math.isfinite(score):
+        score = ""
+    return [sequence, move + 1, score, stats.nodes, f"{elapsed / 1e6:.3f}"]
+
+def read_sequences(file):
+    """
+    Yield the move sequences of a file, skipping empty lines.
+    """
+    for line in file:
+        sequence = line.strip()
+        if sequence:
+            yield sequence
+
+def completed_sequences(path):
+    """
+    Return the sequences already written to an existing output file, in order.
+    A last row that was only partially written before an interruption is removed.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, "r+", newline="") as file:
+        content = file.read()
+        if content and not content.endswith("\n"):
+            content = content[:content.rfind("\n") + 1]
+            file.seek(0)
+            file.truncate()
+            file.write(content)
+    return [row["sequence"] for row in csv.DictReader(io.StringIO(content))]
+
+def analyze(sequences, spec, time_limit, workers, window, seed, writer, flush):
+    """
+    Evaluate the sequences in a process pool and write the rows in input order.
+    At most window positions are submitted to the pool at the same time.
+    """
+    pending = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for index, sequence in enumerate(sequences):
+            pending.append(executor.submit(analyze_position, sequence, spec["engine"], spec["settings"], time_limit, seed + index))
+            if len(pending) >= window:
+                writer.writerow(pending.popleft().result())
+                flush()
+        while pending:
+            writer.writerow(pending.popleft().result())
+            flush()
+
+def main():
+    """
+    Main function to run the batch analysis.
+    """
+    parser = argparse.ArgumentParser(description="Evaluate a file of Connect 4 positions with an engine.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one move sequence per line (default: stdin)")
+    parser.add_argument("-e", "--engine", default="MinimaxPlayer", help="engine specification, e.g. \"MinimaxPlayer:depth=6\"")
+    parser.add_argument("-d", "--depth", type=int, help="search depth (overrides the depth of the engine specification)")
+    parser.add_argument("-t", "--time-limit", type=float, help="time limit per position in seconds")
+    parser.add_argument("-o", "--output", help="CSV output file; existing results are kept and skipped (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--window", type=int, help="maximum number of positions in flight (default: 4 x workers)")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed for the random generators")
+    args = parser.parse_args()
+
+    spec = parse_engine(args.engine)
+    if args.depth is not None:
+        spec["settings"]["depth"] = args.depth
+    create_engine(spec["engine"], 1, **spec["settings"])  # Fail early on unknown engines or settings
+
+    done = completed_sequences(args.output) if args.output else []
+    resume = args.output is not None and os.path.exists(args.output) and os.path.getsize(args.output) > 0
+    input_file = sys.stdin if args.input == "-" else open(args.input, "r")
+    output_file = open(args.output, "a", newline="") if args.output else sys.stdout
+    try:
+        sequences = read_sequences(input_file)
+        for expected, sequence in zip(done, sequences):
+            if sequence != expected:
+                sys.exit(f"Cannot resume: {args.output} does not match the input ({expected} != {sequence})")
+        writer = csv.writer(output_file)
+        if not resume:
+            writer.writerow(FIELDS)
+        analyze(sequences, spec, args.time_limit, args.workers, args.window or 4 * args.workers,
+                args.seed + len(done), writer, output_file.flush)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+if __name__ == "__main__":
+    main()
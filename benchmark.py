@@ -0,0 +1,138 @@
+"""
+Benchmark to measure the speed and move quality of the engines on a fixed workload.
+Every engine plays one move in each position of the sets in Benchmark_Positions (see generate_benchmark_positions.py),
+and the time, searched nodes and correctness (the move keeps the known result) are written to a results file.
+If a baseline results file is given, speed regressions and lost correct moves are reported.
+
+Example:
+    python benchmark.py --output results.json
+    python benchmark.py --baseline results.json -e MinimaxPlayer:depth=5
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import random
+import sys
+
+from game.board import Board
+from algorithms.engines import create_engine, parse_engine
+
+POSITIONS_DIR = "Benchmark_Positions"
+DEFAULT_ENGINES = ["MinimaxPlayer", "MinimaxPlayer3", "MinimaxPlayer2", "MCTSPlayer", "MCTSSolverPlayer", "SolverPlayer:weak=True"]
+
+def load_sets(names=None):
+    """
+    Load the position sets. Every entry is a tuple (sequence, result, good columns as 0-indexed set).
+    """
+    sets = {}
+    for filename in sorted(glob.glob(os.path.join(POSITIONS_DIR, "*.txt"))):
+        name = os.path.splitext(os.path.basename(filename))[0]
+        if names and name not in names:
+            continue
+        with open(filename, "r") as file:
+            positions = []
+            for line in file:
+                if line.strip():
+                    sequence, result, good_moves = line.split()
+                    positions.append((sequence, int(result), {int(c) - 1 for c in good_moves}))
+        sets[name] = positions
+    return sets
+
+def run_position(spec, sequence, good_moves, seed):
+    """
+    Let the engine play one move in the position and return the measurements.
+    """
+    random.seed(seed)
+    board = Board.from_sequence(sequence)
+    piece = 1 if len(sequence) % 2 == 0 else 2
+    player = create_engine(spec["engine"], piece, name=spec["label"], **spec["settings"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        move = player.get_move(board, sequence)
+    stats = player.last_stats
+    return {
+        "sequence": sequence,
+        "move": move + 1,
+        "correct": move in good_moves,
+        "ms": stats.elapsed_ns / 1e6,
+        "nodes": stats.nodes,
+    }
+
+def summarize_set(records):
+    """
+    Summarize the measurements of one engine on one position set.
+    """
+    total_ms = sum(r["ms"] for r in records)
+    return {
+        "positions": len(records),
+        "correct": sum(r["correct"] for r in records),
+        "time_ms": total_ms,
+        "mean_ms": total_ms / len(records) if records else 0,
+        "nodes": sum(r["nodes"] for r in records),
+    }
+
+def compare(results, baseline, tolerance):
+    """
+    Compare the results with a baseline and return a list of regression messages.
+    A set is slower if its time exceeds the baseline by more than the tolerance (e.g. 0.1 for 10%).
+    """
+    regressions = []
+    for label, sets in results.items():
+        for name, summary in sets.items():
+            base = baseline.get(label, {}).get(name)
+            if base is None or base["positions"] != summary["positions"]:
+                continue
+            ratio = summary["time_ms"] / base["time_ms"] if base["time_ms"] else 1
+            print(f"{label:>30} {name:>12}: {summary['time_ms']:10.1f}ms vs {base['time_ms']:10.1f}ms ({ratio - 1:+.1%}), "
+                  f"correct {summary['correct']}/{summary['positions']} vs {base['correct']}/{base['positions']}")
+            if ratio > 1 + tolerance:
+                regressions.append(f"{label} on {name} is {ratio - 1:.1%} slower than the baseline")
+            if summary["correct"] < base["correct"]:
+                regressions.append(f"{label} on {name} finds {base['correct'] - summary['correct']} fewer correct moves")
+    return regressions
+
+def main():
+    """
+    Main function to run the benchmark, save the results and compare them with a baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Connect 4 engines on fixed position sets.")
+    parser.add_argument("-e", "--engine", action="append", help="engine specification, e.g. \"MinimaxPlayer:depth=6\"")
+    parser.add_argument("--sets", nargs="*", help="names of the position sets to run (default: all)")
+    parser.add_argument("--limit", type=int, help="maximum number of positions per set")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed for the random generators")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="results file")
+    parser.add_argument("-b", "--baseline", help="baseline results file to compare with")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.1, help="allowed slowdown before a regression is reported")
+    args = parser.parse_args()
+
+    engines = [parse_engine(spec) for spec in (args.engine or DEFAULT_ENGINES)]
+    sets = load_sets(args.sets)
+
+    results, details = {}, {}
+    for spec in engines:
+        results[spec["label"]], details[spec["label"]] = {}, {}
+        for name, positions in sets.items():
+            records = [run_position(spec, sequence, good_moves, args.seed)
+                       for sequence, _, good_moves in positions[:args.limit]]
+            summary = summarize_set(records)
+            results[spec["label"]][name] = summary
+            details[spec["label"]][name] = records
+            print(f"{spec['label']:>30} {name:>12}: {summary['correct']}/{summary['positions']} correct, "
+                  f"{summary['time_ms']:10.1f}ms, {summary['nodes']} nodes")
+
+    with open(args.output, "w") as file:
+        json.dump({"engines": engines, "results": results, "details": details}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION: {message}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
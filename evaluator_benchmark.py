@@ -0,0 +1,64 @@
+"""
+Micro benchmark of the evaluators of the search engine (see algorithms/evaluators.py). Every evaluator scores all
+positions of the benchmark sets in Benchmark_Positions, and the time per evaluation is reported, so that heuristics
+can be compared independently of the search. Incremental evaluators are reset to each position first, like at the
+root of a search, and timed both with and without the reset.
+
+Example:
+    python evaluator_benchmark.py --repeat 20
+"""
+import argparse
+import time
+
+from game.board import Board
+from algorithms.evaluators import PaperEvaluator, BasicEvaluator, BitboardEvaluator, PaddedBitboardEvaluator
+from benchmark import load_sets
+
+EVALUATORS = {
+    "PaperEvaluator": PaperEvaluator,
+    "BasicEvaluator": BasicEvaluator,
+    "BitboardEvaluator": BitboardEvaluator,
+    "PaddedBitboardEvaluator": PaddedBitboardEvaluator,
+}
+
+def time_evaluations(evaluators, boards, repeat, reset):
+    """
+    Return the best time per evaluation in microseconds over the repetitions. evaluators[i] scores boards[i]
+    for both players, after a reset to the board if reset is set.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for evaluator, board in zip(evaluators, boards):
+            if reset:
+                evaluator.reset(board)
+            evaluator.evaluate(board, 1, 0)
+            evaluator.evaluate(board, 2, 0)
+        best = min(best, (time.perf_counter() - start) / (2 * len(boards)))
+    return best * 1e6
+
+def main():
+    """
+    Main function to run the evaluator benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Measure the time per evaluation of the evaluators.")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="number of repetitions, the best is reported")
+    args = parser.parse_args()
+
+    boards = [Board.from_sequence(sequence) for positions in load_sets().values() for sequence, _, _ in positions]
+    print(f"{len(boards)} positions")
+    for name, cls in EVALUATORS.items():
+        evaluator = cls()
+        if not evaluator.incremental:
+            print(f"{name:>24}: {time_evaluations([evaluator] * len(boards), boards, args.repeat, False):8.1f} us per evaluation")
+            continue
+        # One evaluator per board, reset once, so that only the evaluation itself is timed
+        evaluators = [cls() for _ in boards]
+        for other, board in zip(evaluators, boards):
+            other.reset(board)
+        incremental = time_evaluations(evaluators, boards, args.repeat, False)
+        with_reset = time_evaluations([evaluator] * len(boards), boards, args.repeat, True)
+        print(f"{name:>24}: {incremental:8.1f} us per evaluation, {with_reset:8.1f} us with reset")
+
+if __name__ == "__main__":
+    main()
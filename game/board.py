@@ -6,6 +6,7 @@ and encoding the board state to a bitstring.
 """
 
 import numpy as np
+from game.geometry import get_geometry
 
 class Board:
     def __init__(self, rows=6, columns=7):
@@ -16,6 +17,20 @@ class Board:
         self.columns = columns
         self.board = np.zeros((rows, columns))
 
+    @classmethod
+    def from_sequence(cls, sequence, rows=6, columns=7):
+        """
+        Create a board from a sequence of moves given as 1-indexed column digits (e.g. "4453").
+        Player 1 makes the first move.
+        """
+        board = cls(rows, columns)
+        for i, char in enumerate(sequence):
+            col = int(char) - 1
+            if not 0 <= col < columns or not board.is_valid_move(col):
+                raise ValueError(f"Invalid move sequence: {sequence}")
+            board.drop_piece(col, 1 if i % 2 == 0 else 2)
+        return board
+
     def drop_piece(self, col, piece):
         """
         Drop a piece into the specified column.
@@ -50,26 +65,11 @@ class Board:
         """
         Check if the specified piece has won the game.
         """
-        # Horizontal, vertical, and diagonal checks
-        for row in range(self.rows):
-            for col in range(self.columns - 3):
-                if all(self.board[row][col + i] == piece for i in range(4)):
-                    return True
-        
-        for row in range(self.rows - 3):
-            for col in range(self.columns):
-                if all(self.board[row + i][col] == piece for i in range(4)):
-                    return True
-        
-        for row in range(self.rows - 3):
-            for col in range(self.columns - 3):
-                if all(self.board[row + i][col + i] == piece for i in range(4)):
-                    return True
-
-        for row in range(3, self.rows):
-            for col in range(self.columns - 3):
-                if all(self.board[row - i][col + i] == piece for i in range(4)):
-                    return True
+        # Horizontal, vertical, and diagonal lines of the board geometry, as row-major bitmasks
+        bitboard = self.get_bitboard(piece)
+        for mask in get_geometry(self.rows, self.columns).row_major_masks:
+            if bitboard & mask == mask:
+                return True
         return False
 
     def get_state(self):
@@ -132,20 +132,29 @@ class Board:
         """
         Get the next open row in the specified column.
         """
-        for row in range(self.rows):
+        for row in range(self.rows-1, -1, -1):
             if self.board[row][column] == 0:
                 return row
 
+    def check_winner_at(self, row, col, piece):
+        """
+        Check if the piece at the specified cell is part of four in a row.
+        Only the lines through this cell are inspected, which is much cheaper than check_winner.
+        """
+        geometry = get_geometry(self.rows, self.columns)
+        cells = self.board.ravel().tolist()
+        for index in geometry.cell_lines[row][col]:
+            if geometry.line_getters[index](cells).count(piece) == 4:
+                return True
+        return False
+
     def get_bitboard(self, piece):
         """
         Get the bitboard representation of the board for the specified piece.
         """
-        bitboard = 0
-        for row in range(self.rows):
-            for col in range(self.columns):
-                if self.board[row][col] == piece:
-                    bitboard |= 1 << (row * self.columns + col)
-        return bitboard
+        # Bit row * columns + col is set for the cells of the piece
+        bits = np.packbits(self.board.ravel() == piece, bitorder="little")
+        return int.from_bytes(bits.tobytes(), "little")
 
     def set_board_from_bitboard(self, bitboard, piece):
         """
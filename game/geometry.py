@@ -0,0 +1,74 @@
+"""
+This file defines the static geometry of a Connect 4 board: all lines of four cells on which a player can win,
+their cells in the flattened board, their bitmasks and the lines through every cell. The tables are built once per
+board size (see get_geometry) so that the evaluators and win checks do not rediscover the lines on every call.
+
+Cells are given as (row, col) with row 0 at the top, like in Board. The bitmasks use the row-major layout of
+Board.get_bitboard (bit row * columns + col). The tables are checked by tests/test_geometry.py.
+"""
+
+import functools
+from operator import itemgetter
+
+# Direction names and their (row, col) steps
+DIRECTIONS = {
+    "horizontal": (0, 1),
+    "vertical": (1, 0),
+    "diagonal": (1, 1),
+    "anti_diagonal": (-1, 1),
+}
+
+class Geometry:
+    def __init__(self, rows, columns):
+        """
+        Build the tables for a board with the given number of rows and columns.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.lines = []
+        self.directions = {}
+        # The lines are enumerated in the same order as the loops of the evaluators in evaluators.py
+        self.add_lines("horizontal", [(row, col) for row in range(rows) for col in range(columns - 3)])
+        self.add_lines("vertical", [(row, col) for col in range(columns) for row in range(rows - 3)])
+        self.add_lines("diagonal", [(row, col) for row in range(rows - 3) for col in range(columns - 3)])
+        self.add_lines("anti_diagonal", [(row + 3, col) for row in range(rows - 3) for col in range(columns - 3)])
+        self.lines = tuple(self.lines)
+
+        self.flat_lines = tuple(tuple(self.flat_index(row, col) for row, col in line) for line in self.lines)
+        self.line_getters = tuple(itemgetter(*line) for line in self.flat_lines)
+        self.row_major_masks = tuple(sum(1 << self.flat_index(row, col) for row, col in line) for line in self.lines)
+
+        cell_lines = [[[] for _ in range(columns)] for _ in range(rows)]
+        for index, line in enumerate(self.lines):
+            for row, col in line:
+                cell_lines[row][col].append(index)
+        self.cell_lines = tuple(tuple(tuple(indices) for indices in row) for row in cell_lines)
+
+    def add_lines(self, direction, starts):
+        """
+        Add the lines of a direction, given by their first cells.
+        """
+        d_row, d_col = DIRECTIONS[direction]
+        first = len(self.lines)
+        for row, col in starts:
+            self.lines.append(tuple((row + i * d_row, col + i * d_col) for i in range(4)))
+        self.directions[direction] = range(first, len(self.lines))
+
+    def flat_index(self, row, col):
+        """
+        Index of a cell in the flattened board and bit of the cell in the row-major layout.
+        """
+        return row * self.columns + col
+
+    def lines_of(self, direction):
+        """
+        Return the lines of a direction together with their indices.
+        """
+        return [(index, self.lines[index]) for index in self.directions[direction]]
+
+@functools.lru_cache(maxsize=None)
+def get_geometry(rows=6, columns=7):
+    """
+    Return the (cached) geometry tables of a board size.
+    """
+    return Geometry(rows, columns)
@@ -0,0 +1,41 @@
+"""
+This file defines the HumanPlayer class, which handles the moves of a human player based on mouse input in the
+pygame user interface. It is kept separate from player.py, so that only the user interface imports pygame.
+"""
+
+import pygame as pg
+from game.player import Player
+
+class HumanPlayer(Player):
+    def get_move(self, board, padding, squaresize, events=None):
+        """
+        Get the move for a human player by handling mouse input.
+        If no events are given, the pygame event queue is read.
+        """
+        column_ranges = []
+        for i in range(board.columns):
+            if i == 0:
+                start = 0
+            else:
+                start = i * squaresize + padding
+            end = start + squaresize if i != board.columns - 1 else start + squaresize + padding
+            column_ranges.append((start, end))
+
+        if events is None:
+            events = pg.event.get()
+        for event in events:
+            if event.type == pg.MOUSEBUTTONDOWN:
+                posx = event.pos[0]
+                col = None
+                for idx, (start, end) in enumerate(column_ranges):
+                    if start <= posx <= end:
+                        col = idx
+                        break
+
+                if col is not None:
+                    if board.is_valid_move(col):
+                        return col
+                else:
+                    raise ValueError("Column index out of range")
+
+        return None  
@@ -0,0 +1,58 @@
+"""
+This file defines the MoveWorker class, which computes the move of an engine in a background thread.
+The user interface keeps running while the engine searches, polls the worker for the result and can cancel
+the search, which stops the engine cooperatively through its stop_event.
+"""
+
+import threading
+from game.player import SearchCancelled
+
+class MoveWorker:
+    def __init__(self, player, board, sequence):
+        """
+        Start computing the move of the player for a copy of the board in a background thread.
+        """
+        self.player = player
+        self.stop_event = threading.Event()
+        self.finished = threading.Event()
+        self.move = None
+        self.error = None
+        player.stop_event = self.stop_event
+        self.thread = threading.Thread(target=self.run, args=(board.copy(), sequence), daemon=True)
+        self.thread.start()
+
+    def run(self, board, sequence):
+        """
+        Compute the move. A cancelled search leaves the move at None.
+        """
+        try:
+            move = self.player.get_move(board, sequence)
+            if not self.stop_event.is_set():
+                self.move = move
+        except SearchCancelled:
+            pass
+        except Exception as error:
+            self.error = error
+        finally:
+            self.finished.set()
+
+    def done(self):
+        """
+        Check if the computation has finished.
+        """
+        return self.finished.is_set()
+
+    def result(self):
+        """
+        Return the computed move, or raise the error of the search.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.move
+
+    def cancel(self, timeout=1.0):
+        """
+        Request the engine to stop and wait until the background thread has finished.
+        """
+        self.stop_event.set()
+        self.thread.join(timeout)
@@ -1,9 +1,14 @@
 """
-This file defines the Player class and its subclass HumanPlayer for managing player interactions in the Connect 4 game.
-The Player class serves as a base class, while the HumanPlayer class handles moves based on mouse input.
+This file defines the Player class, the base class of all players in the Connect 4 game.
+The HumanPlayer class, which handles moves based on mouse input, is defined in human_player.py, so that the engines
+can be used without pygame. Engines can be stopped cooperatively: they call check_stop regularly, which raises
+SearchCancelled once the player's stop_event has been set.
 """
 
-import pygame as pg
+class SearchCancelled(Exception):
+    """
+    Raised inside an engine's search when a stop has been requested.
+    """
 
 class Player:
     def __init__(self, name, piece):
@@ -12,6 +17,7 @@ class Player:
         """
         self.name = name
         self.piece = piece
+        self.stop_event = None
     
     def get_move(self, board):
         """
@@ -19,33 +25,9 @@ class Player:
         """
         pass  # This will be overridden by subclasses
 
-class HumanPlayer(Player):
-    def get_move(self, board, padding, squaresize):
+    def check_stop(self):
         """
-        Get the move for a human player by handling mouse input.
+        Raise SearchCancelled if the stop_event (e.g. a threading.Event) has been set.
         """
-        column_ranges = []
-        for i in range(board.columns):
-            if i == 0:
-                start = 0
-            else:
-                start = i * squaresize + padding
-            end = start + squaresize if i != board.columns - 1 else start + squaresize + padding
-            column_ranges.append((start, end))
-
-        for event in pg.event.get():
-            if event.type == pg.MOUSEBUTTONDOWN:
-                posx = event.pos[0]
-                col = None
-                for idx, (start, end) in enumerate(column_ranges):
-                    if start <= posx <= end:
-                        col = idx
-                        break
-
-                if col is not None:
-                    if board.is_valid_move(col):
-                        return col
-                else:
-                    raise ValueError("Column index out of range")
-
-        return None  
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchCancelled()
@@ -0,0 +1,168 @@
+"""
+This file defines the Position class, a compact bitboard representation of a Connect 4 position.
+Every column uses rows + 1 bits (one padding bit on top), counted from the bottom, so that four in a row
+can be detected in every direction with a few shifts and ANDs. The position is stored from the point of view
+of the player to move: current holds the pieces of the player to move and mask holds all pieces.
+Since Connect 4 is left-right symmetric, a position and its mirror image are equivalent: caches and
+transposition tables use the canonical key (the smaller of both keys), and searches only expand one half of
+a symmetric position.
+"""
+
+def mirror_bits(bits, rows=6, columns=7):
+    """
+    Mirror a bitboard left to right.
+    """
+    h = rows + 1
+    column = (1 << h) - 1
+    mirrored = 0
+    for col in range(columns):
+        mirrored |= ((bits >> (col * h)) & column) << ((columns - 1 - col) * h)
+    return mirrored
+
+def is_symmetric(current, mask, rows=6, columns=7):
+    """
+    Check if a position is equal to its mirror image.
+    """
+    h = rows + 1
+    column = (1 << h) - 1
+    # Cheap test first: the outer columns must have the same height
+    if mask & column != (mask >> ((columns - 1) * h)) & column:
+        return False
+    key = current + mask
+    return mirror_bits(key, rows, columns) == key
+
+class Position:
+    def __init__(self, rows=6, columns=7):
+        """
+        Initialize an empty position with the specified number of rows and columns.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.current = 0
+        self.mask = 0
+        self.moves = 0
+
+    @classmethod
+    def from_sequence(cls, sequence, rows=6, columns=7):
+        """
+        Create a position from a sequence of moves given as 1-indexed column digits (e.g. "4453").
+        """
+        position = cls(rows, columns)
+        for char in sequence:
+            col = int(char) - 1
+            if not 0 <= col < columns or not position.can_play(col):
+                raise ValueError(f"Invalid move sequence: {sequence}")
+            position.play(col)
+        return position
+
+    @classmethod
+    def from_board(cls, board, piece):
+        """
+        Create a position from a Board, where piece is the player to move.
+        """
+        position = cls(board.rows, board.columns)
+        cells = board.board.tolist()  # Reading Python lists is much faster than indexing the NumPy array
+        for row in range(board.rows):
+            for col in range(board.columns):
+                cell = cells[row][col]
+                if cell != 0:
+                    bit = 1 << (col * (board.rows + 1) + board.rows - 1 - row)
+                    position.mask |= bit
+                    position.moves += 1
+                    if cell == piece:
+                        position.current |= bit
+        return position
+
+    def copy(self):
+        """
+        Create a copy of the position.
+        """
+        position = Position(self.rows, self.columns)
+        position.current = self.current
+        position.mask = self.mask
+        position.moves = self.moves
+        return position
+
+    def bottom_mask(self, col):
+        """
+        Bitmask of the bottom cell of a column.
+        """
+        return 1 << (col * (self.rows + 1))
+
+    def top_mask(self, col):
+        """
+        Bitmask of the top cell of a column.
+        """
+        return 1 << (self.rows - 1 + col * (self.rows + 1))
+
+    def column_mask(self, col):
+        """
+        Bitmask of all cells of a column.
+        """
+        return ((1 << self.rows) - 1) << (col * (self.rows + 1))
+
+    def can_play(self, col):
+        """
+        Check if a move is valid (i.e., the column is not full).
+        """
+        return self.mask & self.top_mask(col) == 0
+
+    def play(self, col):
+        """
+        Play a move in the specified column for the player to move.
+        """
+        self.current ^= self.mask
+        self.mask |= self.mask + self.bottom_mask(col)
+        self.moves += 1
+
+    def is_winning_move(self, col):
+        """
+        Check if playing the specified column makes the player to move win.
+        """
+        pieces = self.current | ((self.mask + self.bottom_mask(col)) & self.column_mask(col))
+        return self.alignment(pieces)
+
+    def alignment(self, pieces):
+        """
+        Check if the bitboard contains four in a row.
+        """
+        h = self.rows + 1
+        for shift in (1, h - 1, h, h + 1):
+            m = pieces & (pieces >> shift)
+            if m & (m >> (2 * shift)):
+                return True
+        return False
+
+    def key(self):
+        """
+        Unique key of the position (including the player to move).
+        """
+        return self.current + self.mask
+
+    def mirror_key(self):
+        """
+        Key of the left-right mirrored position.
+        """
+        return mirror_bits(self.key(), self.rows, self.columns)
+
+    def canonical_key(self):
+        """
+        Return (key, mirrored): the smaller of the key and the mirrored key, and whether it is the mirrored one
+        (in which case moves stored for the key have to be mirrored too).
+        """
+        key, mirror = self.key(), self.mirror_key()
+        if mirror < key:
+            return mirror, True
+        return key, False
+
+    def is_symmetric(self):
+        """
+        Check if the position is equal to its mirror image.
+        """
+        return is_symmetric(self.current, self.mask, self.rows, self.columns)
+
+    def board_full(self):
+        """
+        Check if all cells are occupied.
+        """
+        return self.moves == self.rows * self.columns
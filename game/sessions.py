@@ -0,0 +1,234 @@
+"""
+This file defines the SessionManager class, which hosts many Connect 4 games in one process.
+Every session only stores its position as bitboard (see position.py), its move sequence and its players, so
+thousands of sessions take little memory. Engine moves are scheduled on a shared work queue that is served by a
+few worker threads: a session is only queued when an engine has to move, so sessions waiting for a human player
+cost nothing. The manager reports the number of moves per second and the time moves waited in the queue.
+"""
+
+import collections
+import itertools
+import queue
+import threading
+import time
+
+from game.board import Board
+from game.position import Position
+from algorithms.engines import create_engine, parse_engine
+from algorithms.stats import percentile
+
+class Session:
+    """
+    A single game. players holds the engine specification of each player, or None for a human player.
+    result is None while the game runs, then the winning piece or 0 for a draw.
+    error is the exception raised while computing an engine move (e.g. an invalid move), which stops the game.
+    """
+    __slots__ = ("id", "current", "mask", "sequence", "players", "result", "error")
+
+    def __init__(self, session_id, players):
+        """
+        Initialize an empty game for two players.
+        """
+        self.id = session_id
+        self.current = 0
+        self.mask = 0
+        self.sequence = ""
+        self.players = players
+        self.result = None
+        self.error = None
+
+    def position(self):
+        """
+        Return the position of the session from the point of view of the player to move.
+        """
+        position = Position()
+        position.current, position.mask, position.moves = self.current, self.mask, len(self.sequence)
+        return position
+
+    def piece_to_move(self):
+        """
+        Return the piece (1 or 2) of the player to move.
+        """
+        return 1 if len(self.sequence) % 2 == 0 else 2
+
+class SessionManager:
+    def __init__(self, workers=4, latency_samples=10000):
+        """
+        Initialize the manager and start the worker threads that compute the engine moves.
+        The queue latency statistics use the most recent latency_samples moves.
+        """
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.work = queue.Queue()
+        self.ids = itertools.count(1)
+        self.specs = {}
+        self.local = threading.local()
+        self.moves = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.latencies = collections.deque(maxlen=latency_samples)
+        self.workers = [threading.Thread(target=self.run, daemon=True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def create_session(self, player1=None, player2=None):
+        """
+        Create a game and return its id. Players are engine specifications (e.g. "MinimaxPlayer:depth=4")
+        or None for a human player, who moves through play.
+        """
+        for spec in (player1, player2):
+            if spec is not None and spec not in self.specs:
+                parsed = parse_engine(spec)
+                create_engine(parsed["engine"], 1, **parsed["settings"])  # Fail early on invalid engines
+                self.specs[spec] = parsed
+        with self.lock:
+            session = Session(next(self.ids), (player1, player2))
+            self.sessions[session.id] = session
+        self.schedule(session)
+        return session.id
+
+    def get_session(self, session_id):
+        """
+        Return the session with the given id.
+        """
+        return self.sessions[session_id]
+
+    def close_session(self, session_id):
+        """
+        Remove a session. A queued engine move of the session is discarded.
+        """
+        with self.lock:
+            self.sessions.pop(session_id, None)
+
+    def play(self, session_id, col):
+        """
+        Play the move of a human player in the column (0-indexed).
+        Raises ValueError if it is not the human's turn or the move is invalid.
+        """
+        with self.lock:
+            session = self.sessions[session_id]
+            if session.result is not None or session.players[session.piece_to_move() - 1] is not None:
+                raise ValueError("It is not the turn of a human player")
+            self.apply(session, col)
+        self.schedule(session)
+
+    def apply(self, session, col):
+        """
+        Play a move in the session and update its result. The lock must be held.
+        """
+        position = session.position()
+        if not 0 <= col < position.columns or not position.can_play(col):
+            raise ValueError(f"Invalid move: {col}")
+        winning = position.is_winning_move(col)
+        position.play(col)
+        session.current, session.mask = position.current, position.mask
+        session.sequence += str(col + 1)
+        if winning:
+            session.result = 2 if session.piece_to_move() == 1 else 1
+        elif position.board_full():
+            session.result = 0
+
+    def schedule(self, session):
+        """
+        Queue the session if an engine has to move next.
+        """
+        if session.result is None and session.error is None and session.players[session.piece_to_move() - 1] is not None:
+            self.work.put((session.id, len(session.sequence), time.perf_counter()))
+
+    def engine(self, spec, piece):
+        """
+        Return the engine of the current worker thread for the specification and piece.
+        Engines keep state during a search, so every worker thread has its own instances.
+        """
+        engines = getattr(self.local, "engines", None)
+        if engines is None:
+            engines = self.local.engines = {}
+        key = (spec, piece)
+        if key not in engines:
+            parsed = self.specs[spec]
+            engines[key] = create_engine(parsed["engine"], piece, **parsed["settings"])
+        return engines[key]
+
+    def run(self):
+        """
+        Worker thread: compute the engine moves of queued sessions.
+        """
+        while True:
+            item = self.work.get()
+            if item is None:
+                self.work.task_done()
+                return
+            session_id, ply, queued = item
+            try:
+                self.move(session_id, ply, time.perf_counter() - queued)
+            except Exception as error:
+                # A failing engine must not stop the worker, which serves all other sessions
+                self.fail(session_id, error)
+            finally:
+                self.work.task_done()
+
+    def fail(self, session_id, error):
+        """
+        Record the error of an engine move on its session. The session is not scheduled again.
+        """
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session.error = error
+            self.errors += 1
+
+    def move(self, session_id, ply, latency):
+        """
+        Compute and play the engine move of a session, if the session still waits for it.
+        """
+        session = self.sessions.get(session_id)
+        if session is None or session.result is not None or len(session.sequence) != ply:
+            return
+        sequence = session.sequence
+        piece = session.piece_to_move()
+        player = self.engine(session.players[piece - 1], piece)
+        col = player.get_move(Board.from_sequence(sequence), sequence)
+        with self.lock:
+            if self.sessions.get(session_id) is not session or session.sequence != sequence:
+                return
+            self.apply(session, col)
+            self.moves += 1
+            self.latencies.append(latency)
+        self.schedule(session)
+
+    def wait(self):
+        """
+        Block until all queued engine moves (including the moves they trigger) have been played.
+        """
+        self.work.join()
+
+    def report(self):
+        """
+        Return the number of sessions, the queue length, the moves per second since the start, the number of
+        failed engine moves and the p50/p90/p99 queue latency in milliseconds.
+        """
+        with self.lock:
+            latencies = list(self.latencies)
+            moves = self.moves
+            errors = self.errors
+            sessions = len(self.sessions)
+        elapsed = time.perf_counter() - self.started
+        return {
+            "sessions": sessions,
+            "queued": self.work.qsize(),
+            "moves": moves,
+            "moves_per_second": moves / elapsed if elapsed else 0,
+            "errors": errors,
+            "queue_p50_ms": percentile(latencies, 50) * 1000,
+            "queue_p90_ms": percentile(latencies, 90) * 1000,
+            "queue_p99_ms": percentile(latencies, 99) * 1000,
+        }
+
+    def shutdown(self):
+        """
+        Stop the worker threads after the queued moves have been played.
+        """
+        for _ in self.workers:
+            self.work.put(None)
+        for worker in self.workers:
+            worker.join()
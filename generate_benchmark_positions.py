@@ -0,0 +1,104 @@
+"""
+File to generate the benchmark position sets in Benchmark_Positions. Positions are created from random games
+(random moves that do not end the game), solved with the exact solver and sorted into begin/middle/end game sets
+that are easy or hard to solve. Every line of a set contains the move sequence (1-indexed columns), the result for the
+player to move (1 win, 0 draw, -1 loss) and the columns (1-indexed) that keep this result.
+This process runs in multiple processes to speed up the execution.
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from game.position import Position
+from algorithms.solver import Solver
+
+OUTPUT_DIR = "Benchmark_Positions"
+POSITIONS_PER_SET = 8
+PHASES = {"begin": (10, 13), "middle": (14, 27), "end": (28, 36)}
+# Node counts of the solver below which a position is easy, and above which it is skipped
+EASY_NODES = {"begin": 10000, "middle": 2000, "end": 200}
+MAX_NODES = {"begin": 300000, "middle": 200000, "end": 50000}
+
+class BudgetExceeded(Exception):
+    pass
+
+class BudgetSolver(Solver):
+    """
+    Solver that gives up once a node budget is used.
+    """
+    def __init__(self, max_nodes):
+        super().__init__()
+        self.max_nodes = max_nodes
+
+    def negamax(self, current, mask, moves, alpha, beta):
+        if self.nodes > self.max_nodes:
+            raise BudgetExceeded()
+        return super().negamax(current, mask, moves, alpha, beta)
+
+def random_position(rng, length):
+    """
+    Play random moves that do not end the game until the sequence has the given length.
+    Returns None if this is not possible.
+    """
+    position = Position()
+    sequence = ""
+    while len(sequence) < length:
+        cols = [col for col in range(position.columns) if position.can_play(col) and not position.is_winning_move(col)]
+        if not cols:
+            return None, None
+        col = rng.choice(cols)
+        position.play(col)
+        sequence += str(col + 1)
+    return position, sequence
+
+def generate(seed, phases):
+    """
+    Generate and solve a single random position for one of the given phases.
+    Returns (set name, line) or None if the position is not useful.
+    """
+    rng = random.Random(seed)
+    phase = rng.choice(phases)
+    position, sequence = random_position(rng, rng.randint(*PHASES[phase]))
+    if position is None or Solver().can_win_next(position.current, position.mask):
+        return None
+
+    solver = BudgetSolver(MAX_NODES[phase])
+    try:
+        result = solver.solve(position, weak=True)
+        nodes = solver.nodes
+        scores = solver.analyze(position, weak=True)
+    except BudgetExceeded:
+        return None
+
+    good_moves = [col for col in range(position.columns) if scores[col] == result]
+    legal_moves = [col for col in range(position.columns) if scores[col] is not None]
+    # Only keep positions that can be won or drawn and where a wrong move exists
+    if result < 0 or len(good_moves) == len(legal_moves):
+        return None
+    difficulty = "easy" if nodes < EASY_NODES[phase] else "hard"
+    return f"{phase}_{difficulty}", f"{sequence} {result} {''.join(str(col + 1) for col in good_moves)}"
+
+def main():
+    """
+    Main function to generate all benchmark position sets.
+    """
+    sets = {f"{phase}_{difficulty}": [] for phase in PHASES for difficulty in ("easy", "hard")}
+    seed = 0
+    with ProcessPoolExecutor() as executor:
+        while any(len(lines) < POSITIONS_PER_SET for lines in sets.values()):
+            phases = [phase for phase in PHASES
+                      if any(len(sets[f"{phase}_{d}"]) < POSITIONS_PER_SET for d in ("easy", "hard"))]
+            for found in executor.map(generate, range(seed, seed + 64), [phases] * 64):
+                if found is not None and len(sets[found[0]]) < POSITIONS_PER_SET:
+                    sets[found[0]].append(found[1])
+            seed += 64
+            print({name: len(lines) for name, lines in sets.items()})
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    for name, lines in sets.items():
+        with open(os.path.join(OUTPUT_DIR, f"{name}.txt"), "w") as file:
+            for line in lines:
+                file.write(f"{line}\n")
+
+if __name__ == "__main__":
+    main()
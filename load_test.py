@@ -0,0 +1,84 @@
+"""
+Load test for the move server (see server.py). Random positions from the benchmark sets are sent to the server
+by several concurrent clients, and the response status counts, the request latency percentiles and the
+throughput are printed.
+
+Example:
+    python server.py --quiet &
+    python load_test.py --requests 200 --concurrency 16 -e MinimaxPlayer:depth=4 --time-limit 2
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+from algorithms.stats import percentile
+from benchmark import load_sets
+
+def send_request(url, sequence, engine, time_limit):
+    """
+    Send one move request and return the HTTP status.
+    """
+    data = json.dumps({"sequence": sequence, "engine": engine, "time_limit": time_limit}).encode()
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as error:
+        return error.code
+
+def main():
+    """
+    Main function to run the load test.
+    """
+    parser = argparse.ArgumentParser(description="Load test the Connect 4 move server.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/move", help="URL of the move endpoint")
+    parser.add_argument("-n", "--requests", type=int, default=100, help="total number of requests")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="number of concurrent clients")
+    parser.add_argument("-e", "--engine", default="MinimaxPlayer", help="engine specification")
+    parser.add_argument("-t", "--time-limit", type=float, default=5.0, help="time limit per request in seconds")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed for the choice of positions")
+    args = parser.parse_args()
+
+    positions = [sequence for entries in load_sets().values() for sequence, _, _ in entries]
+    rng = random.Random(args.seed)
+    sequences = [rng.choice(positions) for _ in range(args.requests)]
+
+    lock = threading.Lock()
+    statuses = Counter()
+    latencies = []
+
+    def client():
+        while True:
+            with lock:
+                if not sequences:
+                    return
+                sequence = sequences.pop()
+            start = time.perf_counter_ns()
+            status = send_request(args.url, sequence, args.engine, args.time_limit)
+            elapsed = time.perf_counter_ns() - start
+            with lock:
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(elapsed)
+
+    start = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.requests} requests in {elapsed:.2f}s ({args.requests / elapsed:.1f} requests/s)")
+    print("Status codes: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+    for p in (50, 90, 99):
+        print(f"p{p}: {percentile(latencies, p) / 1e6:.1f}ms")
+
+if __name__ == "__main__":
+    main()
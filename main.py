@@ -10,33 +10,37 @@ import time
 def play_game(player1, player2, starting_turn):
     """
     Simulate a game between two players starting with the specified turn.
-    Track the execution time for each player and the sequence of moves made.
+    Track the execution time for each player, the sequence of moves made and the search statistics of every move.
     """
     game = Game()
     game.current_turn = starting_turn
 
     execution1_time, execution2_time = 0, 0
     moves = ''
+    records = []
     while True:
         if game.current_turn == 1:
-            start_time = time.time()
+            start_time = time.perf_counter()
             move = player1.get_move(game.board, moves)
-            end_time = time.time()
+            end_time = time.perf_counter()
             execution1_time += end_time - start_time
         else:
-            start_time = time.time()
+            start_time = time.perf_counter()
             move = player2.get_move(game.board, moves)
-            end_time = time.time()
+            end_time = time.perf_counter()
             execution2_time += end_time - start_time
             
-        moves += str(move)  # Track the moves made
+        stats = getattr(player1 if game.current_turn == 1 else player2, "last_stats", None)
+        if stats is not None:
+            records.append({"player": game.current_turn, "ply": len(moves), **stats.as_dict()})
+        moves += str(move + 1)  # Track the moves made (1-indexed, as in the opening book)
         
         result = game.play_turn(move)
         if result == 1:
-            return game.board.board, game.current_turn, execution1_time, execution2_time
+            return game.board.board, game.current_turn, execution1_time, execution2_time, records
         elif result == -1:
             print("The game is a draw!")
-            return game.board.board, -1, execution1_time, execution2_time
+            return game.board.board, -1, execution1_time, execution2_time, records
         
 def main():
     """
@@ -51,7 +55,7 @@ def main():
     for i in range(50):  # Play 50 games for better evaluation
         starting_turn = 1 if i % 2 == 0 else 2
         print("Game ", i + 1)
-        final_board, winner, execution1_time, execution2_time = play_game(player1, player2, starting_turn)
+        final_board, winner, execution1_time, execution2_time, _ = play_game(player1, player2, starting_turn)
         results.append({
             "final_board": final_board,
             "winner": winner,
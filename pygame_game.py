@@ -1,12 +1,15 @@
 """
 This file defines the main game logic and graphical components for playing Connect 4 with a graphical user interface (GUI).
-It includes functions to draw the game board, handle player interactions, display game over popups, and manage the game loop.
+It includes a renderer for the game board, functions to handle player interactions, display game over popups, and manage the game loop.
+Engine moves are computed in a background MoveWorker, so the window keeps redrawing and handling events during a search.
 """
 import pygame as pg
 from game.game import Game
-from game.player import HumanPlayer
-from algorithms.minimax import MinimaxPlayer, MinimaxPlayer2
-from algorithms.mcts import MCTSPlayer
+from game.human_player import HumanPlayer
+from game.move_worker import MoveWorker
+from algorithms.analysis import Analyzer, format_score
+from algorithms.minimax import MinimaxPlayer
+from algorithms.mcts import MCTSPlayer, MCTSSolverPlayer
 
 # Define some colors
 WHITE = (237, 235, 216)
@@ -16,6 +19,7 @@ BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 BUTTON_COLOR = (37, 156, 73)
 BUTTON_HOVER_COLOR = (100, 200, 100)
+BEST_COLOR = (37, 156, 73)
 
 # Define some constants
 ROW_COUNT = 6
@@ -28,60 +32,162 @@ height = (ROW_COUNT + 1) * SQUARESIZE + 2 * PADDING
 size = (width, height)
 button_width = 100
 button_height = 50
+FPS = 30
+OVERLAY_HEIGHT = 28
 
-def draw_board(screen, board, current_turn, font):
+class BoardRenderer:
     """
-    Draw the game board on the screen, including player turn indication.
+    BoardRenderer draws the game board, the turn banner and the menu button. The static board frame and the
+    piece sprites are rendered once, and every frame only the cells and the banner that changed are redrawn
+    and passed to the display as dirty rectangles.
     """
-    if current_turn == 1:
-        turn_text = font.render(f"Player {current_turn}'s Turn", True, BLACK, YELLOW)
-        turn_rect = turn_text.get_rect(center=(width // 2, SQUARESIZE // 2 + PADDING))
-        screen.blit(turn_text, turn_rect)
-    else:
-        turn_text = font.render(f"Player {current_turn}'s Turn", True, BLACK, RED)
-        turn_rect = turn_text.get_rect(center=(width // 2, SQUARESIZE // 2 + PADDING))
-        screen.blit(turn_text, turn_rect)
-
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT):
-            if c == 0 and r == 0:
-                pg.draw.rect(screen, BLUE, (c * SQUARESIZE + PADDING, r * SQUARESIZE + SQUARESIZE + PADDING, SQUARESIZE, SQUARESIZE), border_top_left_radius=10)
-            elif c == COLUMN_COUNT - 1 and r == 0:
-                pg.draw.rect(screen, BLUE, (c * SQUARESIZE + PADDING, r * SQUARESIZE + SQUARESIZE + PADDING, SQUARESIZE, SQUARESIZE), border_top_right_radius=10)
-            elif c == 0 and r == ROW_COUNT - 1:
-                pg.draw.rect(screen, BLUE, (c * SQUARESIZE + PADDING, r * SQUARESIZE + SQUARESIZE + PADDING, SQUARESIZE, SQUARESIZE), border_bottom_left_radius=10)
-            elif c == COLUMN_COUNT - 1 and r == ROW_COUNT - 1:
-                pg.draw.rect(screen, BLUE, (c * SQUARESIZE + PADDING, r * SQUARESIZE + SQUARESIZE + PADDING, SQUARESIZE, SQUARESIZE), border_bottom_right_radius=10)
-            else:
-                pg.draw.rect(screen, BLUE, (c * SQUARESIZE + PADDING, r * SQUARESIZE + SQUARESIZE + PADDING, SQUARESIZE, SQUARESIZE))
-            pg.draw.circle(screen, BLACK, (int(c * SQUARESIZE + SQUARESIZE / 2 + PADDING), int(r * SQUARESIZE + SQUARESIZE + SQUARESIZE / 2 + PADDING)), RADIUS + 2)  
-            pg.draw.circle(screen, WHITE, (int(c * SQUARESIZE + SQUARESIZE / 2 + PADDING), int(r * SQUARESIZE + SQUARESIZE + SQUARESIZE / 2 + PADDING)), RADIUS)  
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT):
-            if board[r][c] == 1:
-                pg.draw.circle(screen, YELLOW, (int(c * SQUARESIZE + SQUARESIZE / 2 + PADDING), height - int(r * SQUARESIZE + SQUARESIZE / 2 + PADDING)), RADIUS)
-            elif board[r][c] == 2:
-                pg.draw.circle(screen, RED, (int(c * SQUARESIZE + SQUARESIZE / 2 + PADDING), height - int(r * SQUARESIZE + SQUARESIZE / 2 + PADDING)), RADIUS)
-    pg.display.update()
+    def __init__(self, screen, font):
+        """
+        Initialize the renderer and pre-render the board frame, piece sprites and menu button.
+        """
+        self.screen = screen
+        self.font = font
+        self.small_font = pg.font.SysFont("monospace", 15)
+        self.board_rect = pg.Rect(PADDING, SQUARESIZE + PADDING, COLUMN_COUNT * SQUARESIZE, ROW_COUNT * SQUARESIZE)
+        self.banner_rect = pg.Rect(0, 0, width - button_width - PADDING, SQUARESIZE + PADDING - OVERLAY_HEIGHT)
+        self.overlay_rect = pg.Rect(PADDING, SQUARESIZE + PADDING - OVERLAY_HEIGHT, COLUMN_COUNT * SQUARESIZE, OVERLAY_HEIGHT)
+        self.button_rect = pg.Rect(width - button_width - PADDING, PADDING, button_width, button_height)
+        self.frame = self.render_frame()
+        self.sprites = {1: self.render_piece(YELLOW), 2: self.render_piece(RED)}
+        self.banners = {}
+        self.buttons = {hovered: self.render_button(hovered) for hovered in (False, True)}
+        self.dirty = []
+        self.invalidate()
 
-def draw_menu_button(screen, font):
-    """
-    Draw the menu button on the screen and handle its interaction.
-    """
-    mouse = pg.mouse.get_pos()
-    click = pg.mouse.get_pressed()
-    button_color = BUTTON_COLOR
-    button_rect = pg.Rect(width - button_width - PADDING, PADDING, button_width, button_height)
-
-    if button_rect.collidepoint(mouse):
-        button_color = BUTTON_HOVER_COLOR
-        if click[0] == 1:
-            return True
-    
-    pg.draw.rect(screen, button_color, button_rect)
-    text = font.render("Menu", True, WHITE)
-    screen.blit(text, (width - button_width - PADDING + 10, PADDING + 10))
-    return False
+    def invalidate(self):
+        """
+        Force a full redraw on the next call to draw.
+        """
+        self.state = None
+        self.cells = None
+        self.banner = None
+        self.hovered = None
+        self.analysis = None
+        self.analysis_drawn = False
+
+    def render_frame(self):
+        """
+        Render the blue board with its empty holes.
+        """
+        frame = pg.Surface(self.board_rect.size)
+        frame.fill(WHITE)
+        for c in range(COLUMN_COUNT):
+            for r in range(ROW_COUNT):
+                rect = (c * SQUARESIZE, r * SQUARESIZE, SQUARESIZE, SQUARESIZE)
+                if c == 0 and r == 0:
+                    pg.draw.rect(frame, BLUE, rect, border_top_left_radius=10)
+                elif c == COLUMN_COUNT - 1 and r == 0:
+                    pg.draw.rect(frame, BLUE, rect, border_top_right_radius=10)
+                elif c == 0 and r == ROW_COUNT - 1:
+                    pg.draw.rect(frame, BLUE, rect, border_bottom_left_radius=10)
+                elif c == COLUMN_COUNT - 1 and r == ROW_COUNT - 1:
+                    pg.draw.rect(frame, BLUE, rect, border_bottom_right_radius=10)
+                else:
+                    pg.draw.rect(frame, BLUE, rect)
+                center = (int(c * SQUARESIZE + SQUARESIZE / 2), int(r * SQUARESIZE + SQUARESIZE / 2))
+                pg.draw.circle(frame, BLACK, center, RADIUS + 2)
+                pg.draw.circle(frame, WHITE, center, RADIUS)
+        return frame
+
+    def render_piece(self, color):
+        """
+        Render a piece of the given color on a transparent surface.
+        """
+        sprite = pg.Surface((2 * RADIUS + 1, 2 * RADIUS + 1), pg.SRCALPHA)
+        pg.draw.circle(sprite, color, (RADIUS, RADIUS), RADIUS)
+        return sprite
+
+    def render_button(self, hovered):
+        """
+        Render the menu button in its normal or hovered state.
+        """
+        button = pg.Surface(self.button_rect.size)
+        button.fill(BUTTON_HOVER_COLOR if hovered else BUTTON_COLOR)
+        button.blit(self.font.render("Menu", True, WHITE), (10, 10))
+        return button
+
+    def draw(self, board, current_turn, thinking=False):
+        """
+        Draw the changed cells of the board (a NumPy array with row 0 at the top) and the turn banner.
+        While an engine is searching, the banner shows that the player is thinking.
+        """
+        state = board.tobytes()
+        if state != self.state:
+            if self.cells is None:
+                self.screen.blit(self.frame, self.board_rect)
+                self.dirty.append(self.board_rect)
+                self.cells = [[0] * COLUMN_COUNT for _ in range(ROW_COUNT)]
+            for r in range(ROW_COUNT):
+                for c in range(COLUMN_COUNT):
+                    piece = int(board[r][c])
+                    if piece != self.cells[r][c]:
+                        self.draw_cell(r, c, piece)
+                        self.cells[r][c] = piece
+            self.state = state
+
+        banner = (current_turn, thinking)
+        if banner != self.banner:
+            if banner not in self.banners:
+                text = f"Player {current_turn} is thinking..." if thinking else f"Player {current_turn}'s Turn"
+                self.banners[banner] = self.font.render(text, True, BLACK, YELLOW if current_turn == 1 else RED)
+            self.screen.fill(WHITE, self.banner_rect)
+            turn_text = self.banners[banner]
+            self.screen.blit(turn_text, turn_text.get_rect(center=(width // 2, SQUARESIZE // 2 + PADDING)))
+            self.dirty.append(self.banner_rect)
+            self.banner = banner
+
+    def draw_cell(self, r, c, piece):
+        """
+        Redraw a single cell of the board from the cached frame and piece sprites.
+        """
+        cell = pg.Rect(c * SQUARESIZE, r * SQUARESIZE, SQUARESIZE, SQUARESIZE)
+        rect = cell.move(self.board_rect.topleft)
+        self.screen.blit(self.frame, rect, cell)
+        if piece in self.sprites:
+            self.screen.blit(self.sprites[piece], (rect.centerx - RADIUS, rect.centery - RADIUS))
+        self.dirty.append(rect)
+
+    def draw_analysis(self, scores):
+        """
+        Draw the analysis overlay above the columns if the scores changed. scores maps columns to tuples
+        (score, depth) for the player to move, the best column is highlighted. With scores None the overlay is cleared.
+        """
+        if self.analysis_drawn and scores == self.analysis:
+            return
+        self.screen.fill(WHITE, self.overlay_rect)
+        if scores:
+            best = max(scores, key=lambda col: scores[col][0])
+            for col, (score, depth) in scores.items():
+                text = self.small_font.render(f"{format_score(score)} d{depth}", True, BEST_COLOR if col == best else BLACK)
+                center = (self.overlay_rect.x + col * SQUARESIZE + SQUARESIZE // 2, self.overlay_rect.centery)
+                self.screen.blit(text, text.get_rect(center=center))
+        self.dirty.append(self.overlay_rect)
+        self.analysis = dict(scores) if scores is not None else None
+        self.analysis_drawn = True
+
+    def draw_menu_button(self):
+        """
+        Draw the menu button if its hover state changed, and return True if it is clicked.
+        """
+        hovered = self.button_rect.collidepoint(pg.mouse.get_pos())
+        if hovered != self.hovered:
+            self.screen.blit(self.buttons[hovered], self.button_rect)
+            self.dirty.append(self.button_rect)
+            self.hovered = hovered
+        return hovered and pg.mouse.get_pressed()[0] == 1
+
+    def update(self):
+        """
+        Push the dirty rectangles to the display.
+        """
+        if self.dirty:
+            pg.display.update(self.dirty)
+            self.dirty = []
 
 def show_game_over_popup(screen, winner, font):
     """
@@ -149,30 +255,50 @@ def show_game_over_popup(screen, winner, font):
 def play_game(screen, player1, player2, font):
     """
     Run the main game loop, handling player moves and updating the display.
+    Engine moves are computed by a MoveWorker while the loop keeps running at a steady frame rate,
+    and a running search is cancelled when the player returns to the menu or closes the window.
+    Pressing 'a' toggles the analysis overlay, which shows the progressive score and search depth of every
+    column for the player to move and restarts whenever a piece is played.
     """
     game = Game()
     moves = ''
     game.current_turn = 1
-    draw_board(screen, game.board.reverse_rows(), game.current_turn, font)
+    clock = pg.time.Clock()
+    worker = None
+    analyzer = None
+    analysis = False
+    analyzed = None
+    renderer = BoardRenderer(screen, font)
 
     pg.display.set_caption("Connect 4")
     while True:
-        if game.current_turn == 1:
-            if isinstance(player1, MinimaxPlayer2) or isinstance(player1, MinimaxPlayer):
-                col = player1.get_move(game.board, moves)
-            else:
-                col = player1.get_move(game.board, PADDING, SQUARESIZE)
-        else:
-            if isinstance(player2, MinimaxPlayer) or isinstance(player2, MCTSPlayer):
-                col = player2.get_move(game.board, moves)
-            else:
-                col = player2.get_move(game.board, PADDING, SQUARESIZE)        
+        clock.tick(FPS)
+        events = pg.event.get()
+        for event in events:
+            if event.type == pg.QUIT:
+                stop_searches(worker, analyzer)
+                return -1
+            if event.type == pg.KEYDOWN and event.key == pg.K_a:
+                analysis = not analysis
+
+        player = player1 if game.current_turn == 1 else player2
+        col = None
+        if isinstance(player, HumanPlayer):
+            col = player.get_move(game.board, PADDING, SQUARESIZE, events)
+        elif worker is None:
+            worker = MoveWorker(player, game.board, moves)
+        elif worker.done():
+            col = worker.result()
+            worker = None
         if col is not None:
             moves += str(col + 1)
             if game.current_turn == 1:
                 if game.board.is_valid_move(col):
                     game.board.drop_piece(col, 1)
                     if game.board.check_winner(1):
+                        stop_searches(worker, analyzer)
+                        renderer.draw(game.board.board, game.current_turn)
+                        renderer.update()
                         print("Player 1 wins!")
                         result = show_game_over_popup(screen, "Player 1", font)
                         return result
@@ -181,18 +307,39 @@ def play_game(screen, player1, player2, font):
                 if game.board.is_valid_move(col):
                     game.board.drop_piece(col, 2)
                     if game.board.check_winner(2):
+                        stop_searches(worker, analyzer)
+                        renderer.draw(game.board.board, game.current_turn)
+                        renderer.update()
                         print("Player 2 wins!")
                         result = show_game_over_popup(screen, "Player 2", font)
                         return result
                     game.current_turn = 1
 
-            draw_board(screen, game.board.reverse_rows(), game.current_turn, font)
+        # Restart the analysis when the position changed, stop it when the overlay is turned off
+        if analyzer is not None and (not analysis or analyzed != moves):
+            analyzer.cancel()
+            analyzer = None
+        if analysis and analyzer is None:
+            analyzer = Analyzer(game.board, game.current_turn)
+            analyzed = moves
+        if analyzer is not None:
+            analyzer.poll()
 
-        draw_board(screen, game.board.reverse_rows(), game.current_turn, font)
-        if draw_menu_button(screen, font):
+        renderer.draw(game.board.board, game.current_turn, thinking=worker is not None)
+        renderer.draw_analysis(analyzer.scores if analyzer is not None else None)
+        if renderer.draw_menu_button():
+            stop_searches(worker, analyzer)
             return 0
-        
-        pg.display.update()
+        renderer.update()
+
+def stop_searches(worker, analyzer):
+    """
+    Cancel the running engine search and analysis, if any.
+    """
+    if worker is not None:
+        worker.cancel()
+    if analyzer is not None:
+        analyzer.cancel()
 
 def create_player(player1_selection, player2_selection):
     """
@@ -204,6 +351,8 @@ def create_player(player1_selection, player2_selection):
         player1 = MinimaxPlayer('Player 1', 1)
     elif player1_selection == "MCTSPlayer":
         player1 = MCTSPlayer('Player 1', 1)
+    elif player1_selection == "MCTSSolverPlayer":
+        player1 = MCTSSolverPlayer('Player 1', 1)
     else:
         player1 = None
 
@@ -213,6 +362,8 @@ def create_player(player1_selection, player2_selection):
         player2 = MinimaxPlayer('Player 2', 2)
     elif player2_selection == "MCTSPlayer":
         player2 = MCTSPlayer('Player 2', 2)
+    elif player2_selection == "MCTSSolverPlayer":
+        player2 = MCTSSolverPlayer('Player 2', 2)
     else:
         player2 = None
 
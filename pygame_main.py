@@ -53,14 +53,14 @@ def main():
         [COLOR_LIST_INACTIVE, COLOR_LIST_ACTIVE],
         width // 4 - dropdown_width // 2, height // 2 - 25, dropdown_width, 50, 
         font, 
-        "Player 1", ["HumanPlayer", "MinimaxPlayer", "MCTSPlayer"])
+        "Player 1", ["HumanPlayer", "MinimaxPlayer", "MCTSPlayer", "MCTSSolverPlayer"])
 
     player2_dropdown = DropDown(
         [COLOR_INACTIVE, COLOR_ACTIVE],
         [COLOR_LIST_INACTIVE, COLOR_LIST_ACTIVE],
         3 * width // 4 - dropdown_width // 2, height // 2 - 25, dropdown_width, 50, 
         font, 
-        "Player 2", ["HumanPlayer", "MinimaxPlayer", "MCTSPlayer"])
+        "Player 2", ["HumanPlayer", "MinimaxPlayer", "MCTSPlayer", "MCTSSolverPlayer"])
 
     play_button = PlayButton(width // 2 - 25, height // 2 + 100, 50, BUTTON_COLOR, BUTTON_HOVER_COLOR)
     
@@ -0,0 +1,257 @@
+"""
+Headless move server with a local HTTP/JSON API, e.g. for serving the engines on a website.
+The moves are computed in a pool of worker processes that is started (with the opening book loaded) before
+the first request, and every worker keeps its most recently used engines between requests (see get_engine).
+Requests beyond the capacity of the pool are rejected with 503 (back-pressure), and requests that do not finish
+within their time limit are answered with 504. With --cache, the results of complete searches are stored in a
+persistent result cache (see algorithms/result_cache.py) and repeated positions are answered from it.
+
+API:
+    POST /move    {"sequence": "4453", "engine": "MinimaxPlayer:depth=6", "time_limit": 2.0}
+                  -> {"move": 4, "score": ..., "stats": {...}}   (moves are 1-indexed columns like the sequence)
+    GET /health   -> number of workers, pending requests and served requests
+
+Example:
+    python server.py --port 8000 --workers 4 --cache results.db
+    curl -X POST localhost:8000/move -d '{"sequence": "4453", "engine": "MinimaxPlayer"}'
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing.util
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from game.board import Board
+from game.player import SearchCancelled
+from algorithms import opening_book
+from algorithms.engines import check_settings, parse_engine, get_engine, timed_move
+from algorithms.result_cache import ResultCache, canonical_key, engine_config
+from algorithms.stats import SearchStats
+
+DEFAULT_ENGINE = "MinimaxPlayer"
+DEFAULT_TIME_LIMIT = 5.0
+MAX_TIME_LIMIT = 60.0
+# Time allowed on top of the time limit for communication with the worker before a request fails with 504
+DEADLINE_GRACE = 1.0
+
+# Result cache of the worker process
+cache = None
+
+def warm_up_worker(cache_path=None):
+    """
+    Initialize a worker process by loading the opening book and opening the result cache.
+    The cache is flushed when the worker process exits.
+    """
+    global cache
+    opening_book.warm_up()
+    if cache_path is not None:
+        cache = ResultCache(cache_path)
+        multiprocessing.util.Finalize(None, cache.close, exitpriority=10)
+
+def ping():
+    """
+    Empty task used to start all worker processes before the first request.
+    """
+    return True
+
+def compute_move(sequence, engine, settings, deadline):
+    """
+    Compute a move in a worker process before the deadline (a time.time() timestamp), which already
+    includes the time the request spent in the queue. Returns the response dictionary, which only holds an error
+    message if the engine rejects the values of its settings.
+    """
+    time_limit = deadline - time.time()
+    if time_limit <= 0:
+        raise SearchCancelled()
+    board = Board.from_sequence(sequence)
+    piece = 1 if len(sequence) % 2 == 0 else 2
+    try:
+        player = get_engine(engine, settings, piece)
+    except ValueError as error:
+        return {"error": f"Invalid engine settings: {error}"}
+    start = time.perf_counter_ns()
+    if cache is not None:
+        key, mirrored = canonical_key(board, piece)
+        key = f"{engine_config(player)}:{key}"
+        cached = cache.get(key)
+        if cached is not None:
+            move, score = cached
+            stats = SearchStats()
+            stats.score = score
+            stats.cached = True
+            stats.elapsed_ns = time.perf_counter_ns() - start
+            move = board.columns - 1 - move if mirrored else move
+            return {"move": move + 1, "score": score, "stats": stats.as_dict()}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        move, stats, complete = timed_move(player, board, sequence, time_limit)
+    if cache is not None and complete:
+        score = stats.score
+        cache.put(key, board.columns - 1 - move if mirrored else move, score if isinstance(score, (int, float)) else None)
+    stats = stats.as_dict()
+    stats["elapsed_ns"] = time.perf_counter_ns() - start
+    score = stats["score"]
+    if isinstance(score, float) and not math.isfinite(score):
+        stats["score"] = score = None
+    return {"move": move + 1, "score": score, "stats": stats}
+
+def parse_request(request):
+    """
+    Validate a move request and return (sequence, engine, settings, time limit).
+    Raises ValueError with a message for invalid requests.
+    """
+    if not isinstance(request, dict):
+        raise ValueError("The request must be a JSON object")
+    sequence = str(request.get("sequence", ""))
+    board = Board.from_sequence(sequence)
+    if board.check_winner(1) or board.check_winner(2) or board.check_draw():
+        raise ValueError("The game is already over")
+    spec = parse_engine(str(request.get("engine", DEFAULT_ENGINE)))
+    check_settings(spec["engine"], spec["settings"])
+    try:
+        time_limit = float(request.get("time_limit", DEFAULT_TIME_LIMIT))
+    except (TypeError, ValueError):
+        raise ValueError("time_limit must be a number")
+    if not 0 < time_limit <= MAX_TIME_LIMIT:
+        raise ValueError(f"time_limit must be between 0 and {MAX_TIME_LIMIT} seconds")
+    return sequence, spec["engine"], spec["settings"], time_limit
+
+class MoveServer(ThreadingHTTPServer):
+    """
+    HTTP server that dispatches move requests to a pre-warmed pool of worker processes.
+    At most max_pending requests are queued or running at the same time.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, workers, max_pending, quiet=False, cache_path=None):
+        """
+        Start the worker processes and bind the server to the address (host, port).
+        If cache_path is given, the workers share a persistent result cache in this SQLite file.
+        """
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=warm_up_worker, initargs=(cache_path,))
+        for future in [self.pool.submit(ping) for _ in range(workers)]:
+            future.result()
+        self.workers = workers
+        self.max_pending = max_pending
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.served = 0
+        self.quiet = quiet
+        super().__init__(address, MoveRequestHandler)
+
+    def dispatch(self, sequence, engine, settings, time_limit):
+        """
+        Submit a move request to the pool and return the future, or None if the server is at capacity.
+        The slot is released when the worker has finished, also if the request has hit its deadline.
+        """
+        if not self.slots.acquire(blocking=False):
+            return None
+        with self.lock:
+            self.pending += 1
+        future = self.pool.submit(compute_move, sequence, engine, settings, time.time() + time_limit)
+        future.add_done_callback(self.release)
+        return future
+
+    def release(self, future):
+        """
+        Release the slot of a finished request.
+        """
+        with self.lock:
+            self.pending -= 1
+            self.served += 1
+        self.slots.release()
+
+    def server_close(self):
+        """
+        Close the server and shut down the worker processes.
+        """
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+class MoveRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        """
+        Handle GET /health.
+        """
+        if self.path != "/health":
+            return self.send_json(404, {"error": "Not found"})
+        with self.server.lock:
+            pending, served = self.server.pending, self.server.served
+        self.send_json(200, {"workers": self.server.workers, "max_pending": self.server.max_pending,
+                             "pending": pending, "served": served})
+
+    def do_POST(self):
+        """
+        Handle POST /move.
+        """
+        if self.path != "/move":
+            return self.send_json(404, {"error": "Not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = parse_request(json.loads(self.rfile.read(length) or b"{}"))
+        except ValueError as error:
+            return self.send_json(400, {"error": str(error)})
+
+        future = self.server.dispatch(*request)
+        if future is None:
+            return self.send_json(503, {"error": "Server busy"}, {"Retry-After": "1"})
+        try:
+            response = future.result(timeout=request[3] + DEADLINE_GRACE)
+        except FutureTimeoutError:
+            return self.send_json(504, {"error": "Deadline exceeded"})
+        except SearchCancelled:
+            return self.send_json(504, {"error": "No move could be computed within the time limit"})
+        except Exception as error:
+            return self.send_json(500, {"error": str(error)})
+        self.send_json(400 if "error" in response else 200, response)
+
+    def send_json(self, status, data, headers=None):
+        """
+        Send a JSON response.
+        """
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """
+        Log requests unless the server runs quietly.
+        """
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+def main():
+    """
+    Main function to start the move server.
+    """
+    parser = argparse.ArgumentParser(description="Serve Connect 4 engine moves over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("-p", "--port", type=int, default=8000, help="port to listen on")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="number of worker processes")
+    parser.add_argument("-m", "--max-pending", type=int, help="maximum number of queued and running requests (default: 2 x workers)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not log requests")
+    parser.add_argument("-c", "--cache", help="SQLite file of the persistent result cache")
+    args = parser.parse_args()
+
+    server = MoveServer((args.host, args.port), args.workers, args.max_pending or 2 * args.workers, args.quiet, args.cache)
+    print(f"Serving moves on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
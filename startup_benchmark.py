@@ -0,0 +1,67 @@
+"""
+Startup benchmark for the headless engine path. Every run starts a fresh Python process that imports the engines
+and the board, creates an engine and computes its first move, so that the cold import and first-move times can
+be compared between versions. It also reports whether pygame or NumPy were loaded.
+
+Example:
+    python startup_benchmark.py --runs 10 -e MinimaxPlayer:depth=4 --sequence 4453
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from algorithms.stats import percentile
+
+# Runs in the child process: time the imports and the first move
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from algorithms.engines import create_engine, parse_engine
+from game.board import Board
+imported = time.perf_counter()
+spec = parse_engine(sys.argv[1])
+sequence = sys.argv[2]
+player = create_engine(spec["engine"], 1 if len(sequence) % 2 == 0 else 2, **spec["settings"])
+player.get_move(Board.from_sequence(sequence), sequence)
+moved = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_move_ms": (moved - imported) * 1000,
+    "pygame": "pygame" in sys.modules,
+    "numpy": "numpy" in sys.modules,
+}))
+"""
+
+def run_once(engine, sequence):
+    """
+    Start a fresh interpreter and return its timings, including the wall time of the whole process.
+    """
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD, engine, sequence], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+def main():
+    """
+    Main function to run the startup benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Measure the cold start time of the engine path.")
+    parser.add_argument("-n", "--runs", type=int, default=10, help="number of fresh processes")
+    parser.add_argument("-e", "--engine", default="MinimaxPlayer", help="engine specification")
+    parser.add_argument("--sequence", default="4453", help="position of the first move (1-indexed columns)")
+    args = parser.parse_args()
+
+    runs = [run_once(args.engine, args.sequence) for _ in range(args.runs)]
+    for key in ("import_ms", "first_move_ms", "process_ms"):
+        values = [run[key] for run in runs]
+        print(f"{key:>14}: median {statistics.median(values):8.1f}  p90 {percentile(values, 90):8.1f}  min {min(values):8.1f}")
+    print(f"pygame loaded: {any(run['pygame'] for run in runs)}, NumPy loaded: {any(run['numpy'] for run in runs)}")
+
+if __name__ == "__main__":
+    main()
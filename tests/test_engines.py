@@ -0,0 +1,66 @@
+"""
+Tests of the engine registry (see algorithms/engines.py) and of the validation of move requests (see server.py).
+"""
+
+import unittest
+from unittest import mock
+
+from algorithms import engines
+from algorithms.engines import check_settings, get_engine
+from server import compute_move, parse_request
+
+class CheckSettingsTest(unittest.TestCase):
+    def test_valid_settings(self):
+        """
+        Settings of the types of the constructor's defaults are accepted.
+        """
+        check_settings("MinimaxPlayer", {"depth": 4, "threats": False, "search": "alphabeta"})
+        check_settings("MCTSSolverPlayer", {"exploration": 1, "time_limit": 0.5, "rave": True})
+
+    def test_invalid_settings(self):
+        """
+        Unknown engines, unknown settings and values of the wrong type raise ValueError.
+        """
+        for engine, settings in [("Nobody", {}), ("MinimaxPlayer", {"iterations": 5}),
+                                 ("MinimaxPlayer", {"piece": 2}), ("MinimaxPlayer", {"depth": "a"}),
+                                 ("MinimaxPlayer", {"depth": 4.5}), ("MinimaxPlayer", {"threats": 1}),
+                                 ("MCTSPlayer", {"time_limit": "a"}), ("MCTSSolverPlayer", {"rave": "yes"})]:
+            with self.subTest(engine=engine, settings=settings):
+                with self.assertRaises(ValueError):
+                    check_settings(engine, settings)
+
+    def test_parse_request(self):
+        """
+        Move requests with invalid engine settings are rejected with ValueError.
+        """
+        self.assertEqual(parse_request({"sequence": "44", "engine": "MinimaxPlayer:depth=4"})[:3],
+                         ("44", "MinimaxPlayer", {"depth": 4}))
+        for engine in ["MinimaxPlayer:depth=a", "MinimaxPlayer:color=red", "Nobody"]:
+            with self.subTest(engine=engine):
+                with self.assertRaises(ValueError):
+                    parse_request({"sequence": "44", "engine": engine})
+
+    def test_rejected_value(self):
+        """
+        A value the engine's constructor rejects gives an error response instead of an exception.
+        """
+        response = compute_move("44", "MinimaxPlayer", {"search": "bogus"}, float("inf"))
+        self.assertIn("search", response["error"])
+
+class GetEngineTest(unittest.TestCase):
+    def test_instances_are_bounded(self):
+        """
+        get_engine reuses its engines and only keeps the most recently used ones.
+        """
+        with mock.patch.object(engines, "instances", engines.OrderedDict()):
+            first = get_engine("MinimaxPlayer", {"depth": 1}, 1)
+            for depth in range(2, engines.MAX_INSTANCES + 1):
+                get_engine("MinimaxPlayer", {"depth": depth}, 1)
+            self.assertIs(get_engine("MinimaxPlayer", {"depth": 1}, 1), first)
+            get_engine("MinimaxPlayer", {"depth": 100}, 1)
+            self.assertEqual(len(engines.instances), engines.MAX_INSTANCES)
+            self.assertIs(get_engine("MinimaxPlayer", {"depth": 1}, 1), first)
+            self.assertNotIn(("MinimaxPlayer", repr([("depth", 2)]), 1), engines.instances)
+
+if __name__ == "__main__":
+    unittest.main()
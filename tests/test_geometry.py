@@ -0,0 +1,99 @@
+"""
+Tests of the board geometry tables (see game/geometry.py) against a brute-force enumeration of the lines of four
+cells, and of the win checks of Board that use them.
+"""
+
+import random
+import unittest
+
+from game.board import Board
+from game.geometry import DIRECTIONS, get_geometry
+
+SIZES = [(6, 7), (5, 6), (7, 8), (4, 4)]
+
+def brute_force_lines(rows, columns):
+    """
+    Return all lines of four cells of a board size as a set of frozensets of (row, col) cells.
+    """
+    lines = set()
+    for row in range(rows):
+        for col in range(columns):
+            for d_row, d_col in DIRECTIONS.values():
+                cells = tuple((row + i * d_row, col + i * d_col) for i in range(4))
+                if all(0 <= r < rows and 0 <= c < columns for r, c in cells):
+                    lines.add(frozenset(cells))
+    return lines
+
+class GeometryTest(unittest.TestCase):
+    def test_lines(self):
+        """
+        The lines are exactly the lines of four cells, each once, split into the four directions.
+        """
+        for rows, columns in SIZES:
+            with self.subTest(rows=rows, columns=columns):
+                geometry = get_geometry(rows, columns)
+                self.assertEqual(len(geometry.lines), len({frozenset(line) for line in geometry.lines}))
+                self.assertEqual({frozenset(line) for line in geometry.lines}, brute_force_lines(rows, columns))
+                self.assertEqual(sum(len(geometry.directions[name]) for name in DIRECTIONS), len(geometry.lines))
+        self.assertEqual(len(get_geometry().lines), 69)
+
+    def test_flat_lines_and_masks(self):
+        """
+        The flattened cells and the row-major bitmasks of every line match its cells.
+        """
+        for rows, columns in SIZES:
+            with self.subTest(rows=rows, columns=columns):
+                geometry = get_geometry(rows, columns)
+                for line, flat_line, mask in zip(geometry.lines, geometry.flat_lines, geometry.row_major_masks):
+                    self.assertEqual(flat_line, tuple(row * columns + col for row, col in line))
+                    self.assertEqual(mask, sum(1 << index for index in flat_line))
+
+    def test_cell_lines(self):
+        """
+        Every cell lists the indices of the lines through it in ascending order.
+        """
+        for rows, columns in SIZES:
+            with self.subTest(rows=rows, columns=columns):
+                geometry = get_geometry(rows, columns)
+                for row in range(rows):
+                    for col in range(columns):
+                        expected = [index for index, line in enumerate(geometry.lines) if (row, col) in line]
+                        self.assertEqual(list(geometry.cell_lines[row][col]), expected)
+
+    def test_cached(self):
+        """
+        The tables are built once per board size.
+        """
+        self.assertIs(get_geometry(6, 7), get_geometry(6, 7))
+        self.assertIsNot(get_geometry(6, 7), get_geometry(5, 6))
+
+class WinCheckTest(unittest.TestCase):
+    def test_check_winner(self):
+        """
+        check_winner and check_winner_at agree with a brute-force check of all lines on random games.
+        """
+        rng = random.Random(0)
+        for rows, columns in SIZES:
+            lines = brute_force_lines(rows, columns)
+            for _ in range(20):
+                board = Board(rows, columns)
+                piece = 1
+                while board.get_valid_moves():
+                    row, col = board.drop_piece(rng.choice(board.get_valid_moves()), piece)
+                    won = any(all(board.board[r][c] == piece for r, c in line) for line in lines)
+                    self.assertEqual(board.check_winner(piece), won)
+                    self.assertEqual(board.check_winner_at(row, col, piece), won)
+                    if won:
+                        break
+                    piece = 3 - piece
+
+    def test_get_bitboard(self):
+        """
+        get_bitboard sets the row-major bits of the cells of a piece.
+        """
+        board = Board.from_sequence("4453")
+        self.assertEqual(board.get_bitboard(1), 1 << 5 * 7 + 3 | 1 << 5 * 7 + 4)
+        self.assertEqual(board.get_bitboard(2), 1 << 4 * 7 + 3 | 1 << 5 * 7 + 2)
+
+if __name__ == "__main__":
+    unittest.main()
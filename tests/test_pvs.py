@@ -0,0 +1,113 @@
+"""
+Tests of the principal variation search of the search engine (see algorithms/pvs.py).
+"""
+
+import unittest
+
+import numpy as np
+
+from game.board import Board
+from game.player import SearchCancelled
+from algorithms.minimax import MinimaxPlayer, MinimaxPlayer2
+
+# Positions in which PaperEvaluator scores reach 1e16, beyond the precision of a float for alpha + 1
+POSITIONS = [
+    "25222271364566515425",
+    "16177762113266545",
+    "2216251154412675726624665775",
+    "2713324257565331216664455652",
+    "1242617441777462351177462251",
+    "57751532326563326623371111265",
+]
+
+def root_score(sequence, **settings):
+    """
+    Search the position with MinimaxPlayer without the threat analysis, symmetry pruning and endgame solver and
+    return the score of the root.
+    """
+    piece = 1 if len(sequence) % 2 == 0 else 2
+    player = MinimaxPlayer("test", piece, threats=False, symmetry=False, endgame_threshold=0, **settings)
+    player.get_move(Board.from_sequence(sequence), sequence)
+    return player.last_stats.score
+
+class SearchScoreTest(unittest.TestCase):
+    def test_pvs_matches_alphabeta(self):
+        """
+        Without reductions, the principal variation search finds the same root score as the alpha-beta search.
+        """
+        for sequence in POSITIONS:
+            with self.subTest(sequence=sequence):
+                self.assertEqual(root_score(sequence, depth=4, reductions=False),
+                                 root_score(sequence, depth=4, search="alphabeta"))
+
+    def test_reductions_match_alphabeta(self):
+        """
+        With reductions, the moves that are not reduced are still searched in full. The reductions do not change
+        the result of these positions at depth 3, so the root score is that of the alpha-beta search.
+        """
+        for sequence in POSITIONS:
+            with self.subTest(sequence=sequence):
+                self.assertEqual(root_score(sequence, depth=3, reductions=True),
+                                 root_score(sequence, depth=3, search="alphabeta"))
+
+class StopAfter:
+    """
+    Stop event that is set after it has been checked a number of times, to cancel a search in the middle.
+    """
+    def __init__(self, checks):
+        """
+        Initialize the event with the number of checks before it is set.
+        """
+        self.checks = checks
+
+    def is_set(self):
+        """
+        Count the check and return whether the event is set.
+        """
+        self.checks -= 1
+        return self.checks < 0
+
+class CancelTest(unittest.TestCase):
+    SEQUENCE = "523274431771672241"
+
+    def cancel(self, player, checks):
+        """
+        Cancel a search of the player after the given number of checks. Returns the board and its state before
+        the search.
+        """
+        board = Board.from_sequence(self.SEQUENCE)
+        state = board.board.copy()
+        player.stop_event = StopAfter(checks)
+        try:
+            player.get_move(board, self.SEQUENCE)
+        except SearchCancelled:
+            pass
+        else:
+            self.assertTrue(player.last_stats.cancelled)
+        return board, state
+
+    def test_pvs_restores_board(self):
+        """
+        A cancelled principal variation search leaves the board and the incremental state of the evaluator as
+        they were.
+        """
+        for checks in (0, 50, 500, 2000):
+            with self.subTest(checks=checks):
+                player = MinimaxPlayer2("test", 1, depth=7)
+                board, state = self.cancel(player, checks)
+                np.testing.assert_array_equal(board.board, state)
+                evaluator = player.evaluator
+                pieces = dict(evaluator.pieces)
+                evaluator.reset(board)
+                self.assertEqual(pieces, evaluator.pieces)
+
+    def test_alphabeta_restores_board(self):
+        """
+        A cancelled alpha-beta search leaves the board as it was.
+        """
+        player = MinimaxPlayer("test", 1, depth=7, search="alphabeta")
+        board, state = self.cancel(player, 500)
+        np.testing.assert_array_equal(board.board, state)
+
+if __name__ == "__main__":
+    unittest.main()
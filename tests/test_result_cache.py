@@ -0,0 +1,39 @@
+"""
+Tests of the engine configurations in the keys of the result cache (see algorithms/result_cache.py).
+"""
+
+import unittest
+
+from algorithms.minimax import MinimaxPlayer, MinimaxPlayer2
+from algorithms.result_cache import engine_config
+
+class EngineConfigTest(unittest.TestCase):
+    def test_same_settings_same_key(self):
+        """
+        Engines with equal settings share their configuration.
+        """
+        self.assertEqual(engine_config(MinimaxPlayer2("a", 1)), engine_config(MinimaxPlayer2("b", 2)))
+
+    def test_evaluator_weights_in_key(self):
+        """
+        Engines whose evaluators have different weights get different configurations.
+        """
+        self.assertNotEqual(engine_config(MinimaxPlayer2("a", 1)), engine_config(MinimaxPlayer2("a", 1, win_score=5)))
+
+    def test_evaluator_class_in_key(self):
+        """
+        Engines with different evaluators get different configurations, even with equal weights.
+        """
+        self.assertNotEqual(engine_config(MinimaxPlayer2("a", 1, heuristic="padded")),
+                            engine_config(MinimaxPlayer2("a", 1, heuristic="rowmajor")))
+        self.assertNotEqual(engine_config(MinimaxPlayer2("a", 1, heuristic="padded")),
+                            engine_config(MinimaxPlayer2("a", 1, heuristic="rowmajor", win_score=5)))
+
+    def test_search_settings_in_key(self):
+        """
+        Engines with different search settings get different configurations.
+        """
+        self.assertNotEqual(engine_config(MinimaxPlayer("a", 1, depth=4)), engine_config(MinimaxPlayer("a", 1, depth=5)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Tests of the SessionManager (see game/sessions.py).
+"""
+
+import unittest
+from unittest import mock
+
+from game.player import Player
+from game.sessions import SessionManager
+from algorithms import engines
+
+class InvalidMovePlayer(Player):
+    """
+    Engine that always plays a column outside the board.
+    """
+    def get_move(self, board, sequence):
+        """
+        Return an invalid column.
+        """
+        return board.columns
+
+class FirstColumnPlayer(Player):
+    """
+    Engine that plays the leftmost column with room left.
+    """
+    def get_move(self, board, sequence):
+        """
+        Return the first valid column.
+        """
+        return next(col for col in range(board.columns) if board.is_valid_move(col))
+
+class SessionManagerTest(unittest.TestCase):
+    def test_worker_survives_invalid_move(self):
+        """
+        An engine error is recorded on its session and the worker goes on with the next queued move.
+        """
+        test_engines = dict(engines.ENGINES, InvalidMovePlayer=InvalidMovePlayer, FirstColumnPlayer=FirstColumnPlayer)
+        with mock.patch.dict(engines.ENGINES, test_engines):
+            manager = SessionManager(workers=1)
+            try:
+                bad = manager.create_session("InvalidMovePlayer", None)
+                good = manager.create_session("FirstColumnPlayer", None)
+                manager.wait()
+                bad_session, good_session = manager.get_session(bad), manager.get_session(good)
+                self.assertIsInstance(bad_session.error, ValueError)
+                self.assertEqual(bad_session.sequence, "")
+                self.assertIsNone(good_session.error)
+                self.assertEqual(good_session.sequence, "1")
+
+                # The worker thread is still alive and serves later moves
+                manager.play(good, 3)
+                manager.wait()
+                self.assertEqual(good_session.sequence, "141")
+                self.assertEqual(manager.report()["errors"], 1)
+            finally:
+                manager.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
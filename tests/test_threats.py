@@ -0,0 +1,45 @@
+"""
+Tests of the threat analysis (see algorithms/threats.py).
+"""
+
+import unittest
+
+from algorithms.threats import board_masks, good_rows, order_moves
+
+def cells(*cells):
+    """
+    Return the bitmask of cells given as (column, row counted from the bottom, starting at 1).
+    """
+    return sum(1 << (col * 7 + row - 1) for col, row in cells)
+
+class ParityTest(unittest.TestCase):
+    # The player to move creates a threat on row 1 with column 2 or 3, and on row 2 with column 6 or on row 4
+    # with column 5
+    CURRENT = cells((0, 1), (1, 1), (5, 1), (4, 2), (5, 2))
+    OPPONENT = cells((4, 1), (6, 1), (0, 2), (1, 2), (0, 3))
+
+    def test_good_rows(self):
+        """
+        The player to move prefers odd rows if the number of pieces is even, whoever has piece 1.
+        """
+        bottom = board_masks()[0]
+        self.assertTrue(good_rows(0) & bottom)
+        self.assertFalse(good_rows(cells((3, 1))) & bottom)
+        self.assertTrue(good_rows(cells((3, 1), (3, 2))) & bottom)
+
+    def test_first_player_prefers_odd_threats(self):
+        """
+        With an even number of pieces, the moves creating a threat on an odd row are ordered first.
+        """
+        mask = self.CURRENT | self.OPPONENT
+        self.assertEqual(order_moves(self.CURRENT, mask, list(range(7)))[:2], [2, 3])
+
+    def test_second_player_prefers_even_threats(self):
+        """
+        With an odd number of pieces, the moves creating a threat on an even row are ordered first.
+        """
+        mask = self.CURRENT | self.OPPONENT | cells((1, 3))
+        self.assertEqual(order_moves(self.CURRENT, mask, list(range(7)))[:2], [5, 6])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Tournament runner to compare the different Algorithms and Heuristics.
+Every pair of engines plays a round-robin match, the games are spread across a process pool,
+and the wins, draws, execution times and per-move latency percentiles (p50/p90/p99) and nodes per second
+per engine and game phase are written to a JSON and a CSV report.
+
+Example:
+    python tournament.py -e MinimaxPlayer:depth=6 -e MinimaxPlayer3:depth=5 -e MCTSSolverPlayer:rave=True --games 20
+"""
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from algorithms.engines import create_engine, parse_engine
+from algorithms.stats import summarize_by_phase
+from main import play_game
+
+def schedule_games(engines, games_per_pair, seed):
+    """
+    Create the round-robin schedule. Each pair plays games_per_pair games, alternating who moves first.
+    Every game gets its own seed so that the tournament is reproducible.
+    """
+    tasks = []
+    for first, second in itertools.combinations(range(len(engines)), 2):
+        for i in range(games_per_pair):
+            tasks.append({
+                "game": len(tasks),
+                "seed": seed + len(tasks),
+                "player1": engines[first],
+                "player2": engines[second],
+                "starting_turn": 1 if i % 2 == 0 else 2,
+            })
+    return tasks
+
+def run_game(task):
+    """
+    Play a single game in a worker process. The engines are created inside the worker,
+    the random generator is seeded and all console output of the game is discarded.
+    """
+    random.seed(task["seed"])
+    player1 = create_engine(task["player1"]["engine"], 1, name=task["player1"]["label"], **task["player1"]["settings"])
+    player2 = create_engine(task["player2"]["engine"], 2, name=task["player2"]["label"], **task["player2"]["settings"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, winner, execution1_time, execution2_time, records = play_game(player1, player2, task["starting_turn"])
+    return {
+        "game": task["game"],
+        "seed": task["seed"],
+        "player1": task["player1"]["label"],
+        "player2": task["player2"]["label"],
+        "starting_turn": task["starting_turn"],
+        "winner": winner,
+        "execution1_time": execution1_time,
+        "execution2_time": execution2_time,
+        "moves": records,
+    }
+
+def aggregate(engines, games):
+    """
+    Aggregate the game results into wins, losses, draws, total execution time and
+    latency statistics of the searched (non-book) moves per engine.
+    """
+    summary = {e["label"]: {"games": 0, "wins": 0, "losses": 0, "draws": 0, "time": 0.0} for e in engines}
+    records = {e["label"]: [] for e in engines}
+    for game in games:
+        for piece, label in ((1, game["player1"]), (2, game["player2"])):
+            entry = summary[label]
+            entry["games"] += 1
+            entry["time"] += game[f"execution{piece}_time"]
+            if game["winner"] == -1:
+                entry["draws"] += 1
+            elif game["winner"] == piece:
+                entry["wins"] += 1
+            else:
+                entry["losses"] += 1
+            records[label].extend(r for r in game["moves"] if r["player"] == piece and not r["book"])
+    for label, entry in summary.items():
+        entry["latency"] = summarize_by_phase(records[label])
+    return summary
+
+def write_report(output, settings, summary, games):
+    """
+    Write the summary and all game results to <output>.json and the summary to <output>.csv.
+    """
+    with open(f"{output}.json", "w") as file:
+        json.dump({"settings": settings, "summary": summary, "games": games}, file, indent=2)
+
+    with open(f"{output}.csv", "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["engine", "phase", "games", "wins", "losses", "draws", "time",
+                         "moves", "p50_ms", "p90_ms", "p99_ms", "nodes_per_second"])
+        for label, entry in summary.items():
+            for phase, latency in entry["latency"].items():
+                writer.writerow([label, phase, entry["games"], entry["wins"], entry["losses"], entry["draws"],
+                                 round(entry["time"], 3), latency["moves"], round(latency["p50_ms"], 3),
+                                 round(latency["p90_ms"], 3), round(latency["p99_ms"], 3),
+                                 round(latency["nodes_per_second"])])
+
+def main():
+    """
+    Main function to run a round-robin tournament between the engines given on the command line.
+    """
+    parser = argparse.ArgumentParser(description="Round-robin tournament between Connect 4 engines.")
+    parser.add_argument("-e", "--engine", action="append", required=True,
+                        help='engine specification, e.g. "MinimaxPlayer:depth=6" (use at least twice)')
+    parser.add_argument("-g", "--games", type=int, default=10, help="games per pair of engines")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="base seed for the random generators")
+    parser.add_argument("-o", "--output", default="tournament", help="report file prefix (.json and .csv)")
+    args = parser.parse_args()
+
+    engines = [parse_engine(spec) for spec in args.engine]
+    if len(engines) < 2:
+        parser.error("at least two engines are required")
+    tasks = schedule_games(engines, args.games, args.seed)
+
+    start_time = time.perf_counter()
+    games = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run_game, task) for task in tasks]
+        for future in as_completed(futures):
+            games.append(future.result())
+            print(f"Finished {len(games)}/{len(tasks)} games", end="\r")
+    games.sort(key=lambda g: g["game"])
+    print()
+
+    summary = aggregate(engines, games)
+    settings = {"engines": engines, "games_per_pair": args.games, "seed": args.seed,
+                "wall_time": time.perf_counter() - start_time}
+    write_report(args.output, settings, summary, games)
+
+    for label, entry in summary.items():
+        print(f"{label}: {entry['wins']} wins, {entry['losses']} losses, {entry['draws']} draws, {entry['time']:.2f}s")
+        for phase, latency in entry["latency"].items():
+            print(f"    {phase:>10}: p50 {latency['p50_ms']:.1f}ms, p90 {latency['p90_ms']:.1f}ms, "
+                  f"p99 {latency['p99_ms']:.1f}ms, {latency['nodes_per_second']:.0f} nodes/s")
+
+if __name__ == "__main__":
+    main()